@@ -1,50 +1,129 @@
 """
 Database configuration and connection management.
 """
+import asyncio
 import os
+import threading
+from typing import Optional, Tuple
+import asyncpg
 from dotenv import load_dotenv
 from supabase import AsyncClient, acreate_client, Client, create_client
 
 
+# Load environment variables (module import runs this exactly once)
+load_dotenv()
+
 # Supabase configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
 
+# Validated (url, key) pair, resolved on first use
+_CREDS: Optional[Tuple[str, str]] = None
+
+# Shared client instances, created lazily and reused for the whole process
+_async_client: Optional[AsyncClient] = None
+_async_lock = asyncio.Lock()
+_sync_client: Optional[Client] = None
+_sync_lock = threading.Lock()
+
+def _get_credentials() -> Tuple[str, str]:
+    """
+    Get the validated Supabase credentials.
+
+    Returns:
+        Tuple[str, str]: The Supabase URL and key
+
+    Raises:
+        ValueError: If required environment variables are not set
+    """
+    global _CREDS
+    if _CREDS is None:
+        if not SUPABASE_URL or not SUPABASE_KEY:
+            raise ValueError(
+                "Missing required environment variables. "
+                "Please ensure SUPABASE_URL and SUPABASE_KEY are set in your .env file."
+            )
+        _CREDS = (SUPABASE_URL, SUPABASE_KEY)
+    return _CREDS
+
 async def get_supabase_client() -> AsyncClient:
     """
-    Get a configured Supabase async client.
-    
+    Get the shared Supabase async client, creating it on first call.
+
     Returns:
         AsyncClient: A configured Supabase async client instance
-    
+
     Raises:
         ValueError: If required environment variables are not set
     """
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError(
-            "Missing required environment variables. "
-            "Please ensure SUPABASE_URL and SUPABASE_KEY are set in your .env file."
-        )
-    
-    return await acreate_client(SUPABASE_URL, SUPABASE_KEY)
+    global _async_client
+    if _async_client is not None:
+        return _async_client
+    async with _async_lock:
+        if _async_client is None:
+            url, key = _get_credentials()
+            _async_client = await acreate_client(url, key)
+    return _async_client
 
 def get_supabase_sync_client() -> Client:
     """
-    Get a configured Supabase sync client.
-    
+    Get the shared Supabase sync client, creating it on first call.
+
     Returns:
         Client: A configured Supabase sync client instance
-    
+
     Raises:
         ValueError: If required environment variables are not set
     """
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError(
-            "Missing required environment variables. "
-            "Please ensure SUPABASE_URL and SUPABASE_KEY are set in your .env file."
-        )
-    
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    global _sync_client
+    if _sync_client is not None:
+        return _sync_client
+    with _sync_lock:
+        if _sync_client is None:
+            url, key = _get_credentials()
+            _sync_client = create_client(url, key)
+    return _sync_client
+
+# Database connection string for migrations and direct Postgres access
+DATABASE_URL = os.getenv('DATABASE_URL')
+
+# Shared asyncpg pool for high-volume writes that bypass PostgREST
+_pg_pool: Optional[asyncpg.Pool] = None
+_pg_pool_lock = asyncio.Lock()
+
+async def get_pg_pool() -> asyncpg.Pool:
+    """
+    Get the shared asyncpg connection pool, creating it on first call.
+
+    Returns:
+        asyncpg.Pool: A connection pool for DATABASE_URL
+
+    Raises:
+        ValueError: If DATABASE_URL is not set
+    """
+    global _pg_pool
+    if _pg_pool is not None:
+        return _pg_pool
+    async with _pg_pool_lock:
+        if _pg_pool is None:
+            if not DATABASE_URL:
+                raise ValueError(
+                    "Missing required environment variable. "
+                    "Please ensure DATABASE_URL is set in your .env file."
+                )
+            _pg_pool = await asyncpg.create_pool(
+                DATABASE_URL,
+                min_size=5,
+                max_size=25,
+                # Drop idle connections instead of holding them for the whole crawl
+                max_inactive_connection_lifetime=300,
+                statement_cache_size=1024,
+            )
+    return _pg_pool
 
-# Database connection string for migrations
-DATABASE_URL = os.getenv('DATABASE_URL') 
\ No newline at end of file
+async def close_pg_pool() -> None:
+    """Close the shared asyncpg pool if it was created."""
+    global _pg_pool
+    if _pg_pool is not None:
+        await _pg_pool.close()
+        _pg_pool = None
\ No newline at end of file
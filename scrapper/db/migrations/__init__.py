@@ -1,6 +1,7 @@
 """
 Database migrations configuration and utilities.
 """
+from functools import lru_cache
 from pathlib import Path
 
 # Migrations directory
@@ -9,9 +10,14 @@ MIGRATIONS_DIR = Path(__file__).parent / 'versions'
 # Ensure migrations directory exists
 MIGRATIONS_DIR.mkdir(exist_ok=True)
 
+@lru_cache(maxsize=4)
+def _list_migration_files(mtime: float) -> tuple:
+    """List migration files for a given directory mtime (cache key only)."""
+    return tuple(sorted(
+        (f for f in MIGRATIONS_DIR.glob('*.sql') if f.is_file()),
+        key=lambda x: x.stem
+    ))
+
 def get_migration_files():
     """Get all migration files in order."""
-    return sorted(
-        [f for f in MIGRATIONS_DIR.glob('*.sql') if f.is_file()],
-        key=lambda x: x.stem
-    ) 
\ No newline at end of file
+    return _list_migration_files(MIGRATIONS_DIR.stat().st_mtime)
@@ -6,6 +6,7 @@ import os
 import sys
 from dotenv import load_dotenv
 from pathlib import Path
+from yoyo import get_backend, read_migrations
 
 # Load environment variables
 load_dotenv()
@@ -23,10 +24,24 @@ if not MIGRATIONS_DIR.exists():
     print(f"Error: Migrations directory not found at {MIGRATIONS_DIR}")
     sys.exit(1)
 
-def run_yoyo(command: str):
-    """Run a yoyo command."""
-    full_command = f"yoyo {command} --database {DATABASE_URL} ./versions"
-    os.system(full_command)
+# Matches migration_table in yoyo.ini
+MIGRATION_TABLE = '_yoyo_migration'
+
+# Session limits so a blocked or runaway migration fails instead of stalling app queries
+LOCK_TIMEOUT = '5s'
+STATEMENT_TIMEOUT = '30min'
+
+def run_yoyo(command: str, backend, migrations):
+    """Run a yoyo command in-process against an existing backend."""
+    with backend.lock():
+        if command == 'apply':
+            backend.apply_migrations(backend.to_apply(migrations))
+        elif command == 'rollback':
+            backend.rollback_migrations(backend.to_rollback(migrations)[:1])
+        elif command == 'list':
+            for migration in migrations:
+                status = 'A' if backend.is_applied(migration) else 'U'
+                print(f"{status}  {migration.id}")
 
 def main():
     """Main entry point."""
@@ -41,19 +56,21 @@ def main():
         sys.exit(1)
 
     command = sys.argv[1]
-    
-    if command == 'apply':
-        run_yoyo('apply')
-    elif command == 'rollback':
-        run_yoyo('rollback')
-    elif command == 'list':
-        run_yoyo('list')
-    elif command == 'reapply':
-        run_yoyo('rollback')
-        run_yoyo('apply')
-    else:
+    if command not in ('apply', 'rollback', 'list', 'reapply'):
         print(f"Unknown command: {command}")
         sys.exit(1)
 
+    # One backend (and DB connection) shared by every step of the command
+    backend = get_backend(DATABASE_URL, migration_table=MIGRATION_TABLE)
+    backend.execute(f"SET lock_timeout = '{LOCK_TIMEOUT}'")
+    backend.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+    migrations = read_migrations(str(MIGRATIONS_DIR))
+
+    if command == 'reapply':
+        run_yoyo('rollback', backend, migrations)
+        run_yoyo('apply', backend, migrations)
+    else:
+        run_yoyo(command, backend, migrations)
+
 if __name__ == '__main__':
     main() 
\ No newline at end of file
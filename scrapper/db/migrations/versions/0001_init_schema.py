@@ -111,10 +111,8 @@ steps = [
         CREATE INDEX idx_scraped_data_category_id ON scraped_data(category_id);
         CREATE INDEX idx_scraped_data_success ON scraped_data(success);
         CREATE INDEX idx_scraped_data_scraped_at ON scraped_data(scraped_at);
-        CREATE INDEX idx_scraped_data_url ON scraped_data(url);
         """,
         """
-        DROP INDEX IF EXISTS idx_scraped_data_url;
         DROP INDEX IF EXISTS idx_scraped_data_scraped_at;
         DROP INDEX IF EXISTS idx_scraped_data_success;
         DROP INDEX IF EXISTS idx_scraped_data_category_id;
@@ -1,11 +1,15 @@
 """
 Migration to update stock info schema.
 Removes stock_status and stock_quantity columns, adds stock_info JSONB column.
+
+Runs outside a transaction so the data copy can commit in id-range batches
+instead of holding row locks on the whole table in one UPDATE.
 """
 
 from yoyo import step
 
 __depends__ = {'0007_convert_stock_status_to_varchar'}
+__transactional__ = False
 
 steps = [
     # Add new stock_info column
@@ -14,18 +18,48 @@ steps = [
         "ALTER TABLE scraped_data DROP COLUMN stock_info"
     ),
     
-    # Copy data from old columns to new format
-    step("""
-        UPDATE scraped_data 
-        SET stock_info = jsonb_build_array(
-            jsonb_build_object(
-                'status', stock_status,
-                'delivery_method', 'HOME_DELIVERY',
-                'store_count', stock_quantity
-            )
-        )
+    # Temporary partial index so each batch only visits rows with stock data
+    step(
+        """
+        CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_scraped_stock_nonnull
+        ON scraped_data(id)
         WHERE stock_status IS NOT NULL OR stock_quantity IS NOT NULL
+        """,
+        "DROP INDEX IF EXISTS idx_scraped_stock_nonnull"
+    ),
+
+    # Copy data from old columns to new format, committing every 10k ids
+    step("""
+        DO $$
+        DECLARE
+            min_id INTEGER;
+            max_id INTEGER;
+            lo INTEGER;
+        BEGIN
+            SELECT min(id), max(id) INTO min_id, max_id FROM scraped_data;
+            IF min_id IS NULL THEN
+                RETURN;
+            END IF;
+
+            FOR lo IN min_id..max_id BY 10000 LOOP
+                UPDATE scraped_data 
+                SET stock_info = jsonb_build_array(
+                    jsonb_build_object(
+                        'status', stock_status,
+                        'delivery_method', 'HOME_DELIVERY',
+                        'store_count', stock_quantity
+                    )
+                )
+                WHERE id BETWEEN lo AND lo + 9999
+                  AND (stock_status IS NOT NULL OR stock_quantity IS NOT NULL);
+                COMMIT;
+            END LOOP;
+        END
+        $$
     """),
+
+    # Drop the temporary index
+    step("DROP INDEX IF EXISTS idx_scraped_stock_nonnull"),
     
     # Drop old columns
     step(
@@ -0,0 +1,26 @@
+from yoyo import step
+
+__depends__ = {'0014_create_price_history'}
+
+steps = [
+    step(
+        # Apply SQL - upsert the full retailer set in a single statement
+        """
+        INSERT INTO retailers (name, type, country)
+        SELECT * FROM UNNEST(
+            ARRAY['Datart', 'Euronics', 'MediaMarkt', 'Pilulka',
+                  'Planeo', 'Telekom', 'Zbozi', 'Alza']::varchar[],
+            ARRAY['DIRECT_RETAILER', 'DIRECT_RETAILER', 'DIRECT_RETAILER', 'DIRECT_RETAILER',
+                  'DIRECT_RETAILER', 'DIRECT_RETAILER', 'PRICE_COMPARER', 'DIRECT_RETAILER']::retailer_type[],
+            ARRAY['CZ', 'CZ', 'HU', 'CZ',
+                  'CZ', 'CZ', 'CZ', 'HU']::char(2)[]
+        )
+        ON CONFLICT (name) DO UPDATE 
+        SET 
+            type = EXCLUDED.type,
+            country = EXCLUDED.country,
+            updated_at = CURRENT_TIMESTAMP;
+        """
+        # No rollback - the rows are owned by 0002/0009
+    )
+]
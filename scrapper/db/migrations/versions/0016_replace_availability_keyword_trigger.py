@@ -0,0 +1,67 @@
+"""
+Replace the availability keyword AFTER INSERT trigger with an upsert function.
+
+The trigger re-updated the row it had just inserted, doubling writes per
+keyword. Callers now go through upsert_availability_keyword(), which bumps
+last_seen_at/occurrence_count via ON CONFLICT on UNIQUE(retailer_id, keyword).
+"""
+
+from yoyo import step
+
+__depends__ = {'0015_seed_retailers'}
+
+steps = [
+    step(
+        """
+        DROP TRIGGER IF EXISTS tr_update_availability_keyword ON availability_keywords;
+        DROP FUNCTION IF EXISTS update_availability_keyword();
+
+        CREATE OR REPLACE FUNCTION upsert_availability_keyword(
+            p_retailer_id INTEGER,
+            p_keyword TEXT,
+            p_language VARCHAR(10) DEFAULT NULL,
+            p_indicates_in_stock BOOLEAN DEFAULT NULL,
+            p_first_seen_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            p_last_seen_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            p_occurrence_count INTEGER DEFAULT 1,
+            p_is_configured BOOLEAN DEFAULT FALSE
+        ) RETURNS SETOF availability_keywords AS $$
+            INSERT INTO availability_keywords (
+                retailer_id, keyword, language, indicates_in_stock,
+                first_seen_at, last_seen_at, occurrence_count, is_configured
+            )
+            VALUES (
+                p_retailer_id, p_keyword, p_language, p_indicates_in_stock,
+                p_first_seen_at, p_last_seen_at, p_occurrence_count, p_is_configured
+            )
+            ON CONFLICT (retailer_id, keyword) DO UPDATE
+            SET last_seen_at = CURRENT_TIMESTAMP,
+                occurrence_count = availability_keywords.occurrence_count + 1
+            RETURNING *;
+        $$ LANGUAGE sql;
+        """,
+        # Rollback
+        """
+        DROP FUNCTION IF EXISTS upsert_availability_keyword(
+            INTEGER, TEXT, VARCHAR, BOOLEAN,
+            TIMESTAMP WITH TIME ZONE, TIMESTAMP WITH TIME ZONE, INTEGER, BOOLEAN
+        );
+
+        CREATE OR REPLACE FUNCTION update_availability_keyword() RETURNS trigger AS $$
+        BEGIN
+            UPDATE availability_keywords 
+            SET last_seen_at = CURRENT_TIMESTAMP,
+                occurrence_count = occurrence_count + 1
+            WHERE retailer_id = NEW.retailer_id AND keyword = NEW.keyword;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER tr_update_availability_keyword
+        AFTER INSERT ON availability_keywords
+        FOR EACH ROW
+        WHEN (NEW.id IS NOT NULL)
+        EXECUTE FUNCTION update_availability_keyword();
+        """
+    )
+]
@@ -0,0 +1,120 @@
+"""
+Recreate price_history as a table partitioned by month on scraped_at.
+
+Range queries over recent history only touch the matching partitions, and
+the scraped_at btree is replaced by a much smaller BRIN index since rows
+arrive in roughly scraped_at order. Partitions for the existing data range
+and the next 12 months are created here; create_price_history_partition()
+can be called to add later months, and a default partition catches anything
+outside the prepared range.
+"""
+
+from yoyo import step
+
+__depends__ = {'0016_replace_availability_keyword_trigger'}
+
+steps = [
+    # Move the existing table out of the way
+    step(
+        """
+        DROP INDEX IF EXISTS idx_price_history_scraped_at;
+        DROP INDEX IF EXISTS idx_price_history_product_time;
+        ALTER TABLE price_history RENAME TO price_history_old;
+        ALTER TABLE price_history_old RENAME CONSTRAINT price_history_pkey TO price_history_old_pkey;
+        """,
+        """
+        ALTER TABLE price_history_old RENAME CONSTRAINT price_history_old_pkey TO price_history_pkey;
+        ALTER TABLE price_history_old RENAME TO price_history;
+        CREATE INDEX idx_price_history_product_time ON price_history(retailer_product_id, scraped_at DESC);
+        CREATE INDEX idx_price_history_scraped_at ON price_history(scraped_at DESC);
+        """
+    ),
+
+    # Create the partitioned table and its partitions
+    step(
+        """
+        CREATE TABLE price_history (
+            id INTEGER NOT NULL DEFAULT nextval('price_history_id_seq'),
+            retailer_product_id INTEGER NOT NULL REFERENCES retailer_products(id) ON DELETE CASCADE,
+            price DECIMAL(12, 2),
+            currency VARCHAR(3),
+            stock_info JSONB DEFAULT '[]'::jsonb,
+            offers JSONB DEFAULT '[]'::jsonb, -- For aggregators with multiple offers
+            scraped_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+            PRIMARY KEY (id, scraped_at)
+        ) PARTITION BY RANGE (scraped_at);
+
+        CREATE OR REPLACE FUNCTION create_price_history_partition(p_month DATE) RETURNS void AS $$
+        DECLARE
+            start_date DATE := date_trunc('month', p_month)::date;
+            end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::date;
+        BEGIN
+            EXECUTE format(
+                'CREATE TABLE IF NOT EXISTS %I PARTITION OF price_history FOR VALUES FROM (%L) TO (%L)',
+                'price_history_' || to_char(start_date, 'YYYY_MM'), start_date, end_date
+            );
+        END;
+        $$ LANGUAGE plpgsql;
+
+        DO $$
+        DECLARE
+            month_start TIMESTAMP WITH TIME ZONE;
+        BEGIN
+            FOR month_start IN
+                SELECT generate_series(
+                    date_trunc('month', coalesce((SELECT min(scraped_at) FROM price_history_old), now())),
+                    date_trunc('month', now()) + INTERVAL '12 months',
+                    INTERVAL '1 month'
+                )
+            LOOP
+                PERFORM create_price_history_partition(month_start::date);
+            END LOOP;
+        END
+        $$;
+
+        CREATE TABLE price_history_default PARTITION OF price_history DEFAULT;
+
+        -- Optimize for time series queries
+        CREATE INDEX idx_price_history_product_time ON price_history(retailer_product_id, scraped_at DESC);
+        CREATE INDEX idx_price_history_scraped_at ON price_history USING BRIN (scraped_at);
+        """,
+        """
+        DROP TABLE IF EXISTS price_history CASCADE;
+        DROP FUNCTION IF EXISTS create_price_history_partition(DATE);
+        """
+    ),
+
+    # Copy the data and drop the old table (the sequence moves to the new table first)
+    step(
+        """
+        INSERT INTO price_history (id, retailer_product_id, price, currency, stock_info, offers, scraped_at, created_at)
+        SELECT id, retailer_product_id, price, currency, stock_info, offers, scraped_at, created_at
+        FROM price_history_old;
+
+        ALTER SEQUENCE price_history_id_seq OWNED BY price_history.id;
+        DROP TABLE price_history_old;
+        """,
+        """
+        CREATE TABLE price_history_old (
+            id INTEGER NOT NULL DEFAULT nextval('price_history_id_seq'),
+            retailer_product_id INTEGER NOT NULL REFERENCES retailer_products(id) ON DELETE CASCADE,
+            price DECIMAL(12, 2),
+            currency VARCHAR(3),
+            stock_info JSONB DEFAULT '[]'::jsonb,
+            offers JSONB DEFAULT '[]'::jsonb,
+            scraped_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT price_history_old_pkey PRIMARY KEY (id)
+        );
+
+        INSERT INTO price_history_old (id, retailer_product_id, price, currency, stock_info, offers, scraped_at, created_at)
+        SELECT id, retailer_product_id, price, currency, stock_info, offers, scraped_at, created_at
+        FROM price_history;
+
+        ALTER SEQUENCE price_history_id_seq OWNED BY price_history_old.id;
+        """
+    )
+]
@@ -0,0 +1,35 @@
+"""
+Widen primary keys of the high-volume tables (and the FK columns pointing at
+them) to BIGINT while the tables are still small.
+"""
+
+from yoyo import step
+
+__depends__ = {'0017_partition_price_history'}
+
+steps = [
+    step(
+        """
+        ALTER TABLE retailer_products ALTER COLUMN id TYPE BIGINT;
+        ALTER SEQUENCE retailer_products_id_seq AS BIGINT;
+
+        ALTER TABLE price_history ALTER COLUMN id TYPE BIGINT;
+        ALTER TABLE price_history ALTER COLUMN retailer_product_id TYPE BIGINT;
+        ALTER SEQUENCE price_history_id_seq AS BIGINT;
+
+        ALTER TABLE availability_keywords ALTER COLUMN id TYPE BIGINT;
+        ALTER SEQUENCE availability_keywords_id_seq AS BIGINT;
+        """,
+        """
+        ALTER SEQUENCE availability_keywords_id_seq AS INTEGER;
+        ALTER TABLE availability_keywords ALTER COLUMN id TYPE INTEGER;
+
+        ALTER SEQUENCE price_history_id_seq AS INTEGER;
+        ALTER TABLE price_history ALTER COLUMN retailer_product_id TYPE INTEGER;
+        ALTER TABLE price_history ALTER COLUMN id TYPE INTEGER;
+
+        ALTER SEQUENCE retailer_products_id_seq AS INTEGER;
+        ALTER TABLE retailer_products ALTER COLUMN id TYPE INTEGER;
+        """
+    )
+]
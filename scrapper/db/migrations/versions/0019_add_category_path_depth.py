@@ -0,0 +1,17 @@
+from yoyo import step
+
+__depends__ = {'0018_bigint_ids'}
+
+steps = [
+    step(
+        """
+        ALTER TABLE categories
+            ADD COLUMN path_depth INTEGER GENERATED ALWAYS AS (nlevel(path)) STORED;
+        CREATE INDEX idx_categories_path_depth ON categories(path_depth);
+        """,
+        """
+        DROP INDEX IF EXISTS idx_categories_path_depth;
+        ALTER TABLE categories DROP COLUMN IF EXISTS path_depth;
+        """
+    )
+]
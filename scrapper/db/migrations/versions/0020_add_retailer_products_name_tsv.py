@@ -0,0 +1,20 @@
+from yoyo import step
+
+__depends__ = {'0019_add_category_path_depth'}
+
+steps = [
+    step(
+        """
+        ALTER TABLE retailer_products
+            ADD COLUMN name_tsv tsvector
+            GENERATED ALWAYS AS (to_tsvector('english', coalesce(name, ''))) STORED;
+        DROP INDEX IF EXISTS idx_retailer_products_name;
+        CREATE INDEX idx_retailer_products_name_tsv ON retailer_products USING GIN (name_tsv);
+        """,
+        """
+        DROP INDEX IF EXISTS idx_retailer_products_name_tsv;
+        ALTER TABLE retailer_products DROP COLUMN IF EXISTS name_tsv;
+        CREATE INDEX idx_retailer_products_name ON retailer_products USING gin(to_tsvector('english', name));
+        """
+    )
+]
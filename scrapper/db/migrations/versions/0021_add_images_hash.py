@@ -0,0 +1,16 @@
+from yoyo import step
+
+__depends__ = {'0020_add_retailer_products_name_tsv'}
+
+steps = [
+    step(
+        """
+        ALTER TABLE retailer_products ADD COLUMN images_hash BYTEA;
+        ALTER TABLE price_history ADD COLUMN images_sha BYTEA;
+        """,
+        """
+        ALTER TABLE price_history DROP COLUMN IF EXISTS images_sha;
+        ALTER TABLE retailer_products DROP COLUMN IF EXISTS images_hash;
+        """
+    )
+]
@@ -0,0 +1,33 @@
+from yoyo import step
+
+__depends__ = {'0021_add_images_hash'}
+
+# updated_at is now set by the application on write (see BaseRepository.update)
+steps = [
+    step(
+        """
+        DROP TRIGGER IF EXISTS update_retailers_updated_at ON retailers;
+        DROP TRIGGER IF EXISTS update_categories_updated_at ON categories;
+        DROP FUNCTION IF EXISTS update_updated_at_column();
+        """,
+        """
+        CREATE OR REPLACE FUNCTION update_updated_at_column()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.updated_at = CURRENT_TIMESTAMP;
+            RETURN NEW;
+        END;
+        $$ language 'plpgsql';
+
+        CREATE TRIGGER update_retailers_updated_at
+            BEFORE UPDATE ON retailers
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+
+        CREATE TRIGGER update_categories_updated_at
+            BEFORE UPDATE ON categories
+            FOR EACH ROW
+            EXECUTE FUNCTION update_updated_at_column();
+        """
+    )
+]
@@ -0,0 +1,31 @@
+"""
+Add reparent_category() to move a category subtree in one statement.
+
+CategoryRepository.update used to load every descendant and PATCH each one;
+this rewrites all descendant paths with a single UPDATE.
+"""
+
+from yoyo import step
+
+__depends__ = {'0022_drop_updated_at_triggers'}
+
+steps = [
+    step(
+        """
+        CREATE OR REPLACE FUNCTION reparent_category(old_path ltree, new_path ltree)
+        RETURNS INTEGER AS $$
+            WITH moved AS (
+                UPDATE categories
+                SET path = new_path || subpath(path, nlevel(old_path)),
+                    updated_at = CURRENT_TIMESTAMP
+                WHERE path <@ old_path AND path <> old_path
+                RETURNING 1
+            )
+            SELECT count(*)::INTEGER FROM moved;
+        $$ LANGUAGE sql;
+        """,
+        """
+        DROP FUNCTION IF EXISTS reparent_category(ltree, ltree);
+        """
+    )
+]
@@ -0,0 +1,15 @@
+from yoyo import step
+
+__depends__ = {'0023_add_reparent_category'}
+
+# Case-insensitive equality on retailers.name can use the UNIQUE index directly
+steps = [
+    step(
+        "CREATE EXTENSION IF NOT EXISTS citext",
+        None
+    ),
+    step(
+        "ALTER TABLE retailers ALTER COLUMN name TYPE citext",
+        "ALTER TABLE retailers ALTER COLUMN name TYPE VARCHAR(50)"
+    )
+]
@@ -0,0 +1,30 @@
+"""
+Add ltree descendant/ancestor lookups for CategoryRepository.
+
+PostgREST has no filter for the <@ / @> operators, so the repository fell back
+to LIKE patterns that can't use idx_categories_path (GiST).
+"""
+
+from yoyo import step
+
+__depends__ = {'0024_retailers_name_citext'}
+
+steps = [
+    step(
+        """
+        CREATE OR REPLACE FUNCTION category_descendants(p ltree)
+        RETURNS SETOF categories AS $$
+            SELECT * FROM categories WHERE path <@ p AND path <> p;
+        $$ LANGUAGE sql STABLE;
+
+        CREATE OR REPLACE FUNCTION category_ancestors(p ltree)
+        RETURNS SETOF categories AS $$
+            SELECT * FROM categories WHERE path @> p AND path <> p;
+        $$ LANGUAGE sql STABLE;
+        """,
+        """
+        DROP FUNCTION IF EXISTS category_ancestors(ltree);
+        DROP FUNCTION IF EXISTS category_descendants(ltree);
+        """
+    )
+]
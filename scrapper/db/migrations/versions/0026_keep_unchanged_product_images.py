@@ -0,0 +1,35 @@
+"""
+Keep the stored retailer_products.images when a write carries the same images_hash.
+
+Upserts always send images; comparing against the stored hash here means an
+unchanged TEXT[] keeps its existing (TOASTed) value instead of being rewritten
+on every re-scrape.
+"""
+
+from yoyo import step
+
+__depends__ = {'0025_add_category_tree_functions'}
+
+steps = [
+    step(
+        """
+        CREATE OR REPLACE FUNCTION keep_unchanged_product_images()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            NEW.images = OLD.images;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+
+        CREATE TRIGGER keep_unchanged_retailer_product_images
+            BEFORE UPDATE ON retailer_products
+            FOR EACH ROW
+            WHEN (NEW.images_hash IS NOT NULL AND NEW.images_hash = OLD.images_hash)
+            EXECUTE FUNCTION keep_unchanged_product_images();
+        """,
+        """
+        DROP TRIGGER IF EXISTS keep_unchanged_retailer_product_images ON retailer_products;
+        DROP FUNCTION IF EXISTS keep_unchanged_product_images();
+        """
+    )
+]
@@ -2,6 +2,7 @@ from scrapper.db.models.base import BaseModel
 from scrapper.db.models.enums import RetailerType, Currency
 from scrapper.db.models.retailer import RetailerData
 from scrapper.db.models.category import CategoryData
+from scrapper.db.models.category_trie import CategoryTrie
 from scrapper.db.models.product import ProductData
 from scrapper.db.models.scraped_data import ScrapedData
 from scrapper.db.models.availability_keyword import AvailabilityKeyword
@@ -13,6 +14,7 @@ __all__ = [
     'Currency',
     'RetailerData',
     'CategoryData',
+    'CategoryTrie',
     'ProductData',
     'ScrapedData',
     'AvailabilityKeyword',
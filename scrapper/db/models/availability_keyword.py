@@ -1,35 +1,26 @@
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
-from scrapper.db.models.base import BaseModel
+from scrapper.db.models.base import BaseModel, utcnow
 
-@dataclass
+@dataclass(kw_only=True, slots=True)
 class AvailabilityKeyword(BaseModel):
     """Model representing an availability keyword for a retailer."""
-    
-    def __init__(
-        self,
-        retailer_id: int,
-        keyword: str,
-        language: Optional[str] = None,
-        indicates_in_stock: Optional[bool] = None,
-        first_seen_at: Optional[datetime] = None,
-        last_seen_at: Optional[datetime] = None,
-        occurrence_count: int = 1,
-        is_configured: bool = False,
-        id: Optional[int] = None,
-        created_at: Optional[datetime] = None,
-        updated_at: Optional[datetime] = None
-    ):
-        super().__init__(id=id, created_at=created_at, updated_at=updated_at)
-        self.retailer_id = retailer_id
-        self.keyword = keyword
-        self.language = language
-        self.indicates_in_stock = indicates_in_stock
-        self.first_seen_at = first_seen_at or datetime.now()
-        self.last_seen_at = last_seen_at or datetime.now()
-        self.occurrence_count = occurrence_count
-        self.is_configured = is_configured
+    retailer_id: int
+    keyword: str
+    language: Optional[str] = None
+    indicates_in_stock: Optional[bool] = None
+    first_seen_at: Optional[datetime] = None
+    last_seen_at: Optional[datetime] = None
+    occurrence_count: int = 1
+    is_configured: bool = False
+
+    def __post_init__(self):
+        """Default missing first/last seen times to now"""
+        if self.first_seen_at is None:
+            self.first_seen_at = utcnow()
+        if self.last_seen_at is None:
+            self.last_seen_at = utcnow()
 
     @classmethod
     def from_row(cls, row: dict) -> 'AvailabilityKeyword':
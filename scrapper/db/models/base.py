@@ -1,20 +1,46 @@
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from typing import Optional
+from ciso8601 import parse_datetime
 
-@dataclass(kw_only=True)
+def utcnow() -> datetime:
+    """Current time as an aware UTC datetime (no local timezone lookup)"""
+    return datetime.now(timezone.utc)
+
+_DATETIME_TYPES = (datetime, Optional[datetime], 'datetime', 'Optional[datetime]')
+
+@dataclass(kw_only=True, slots=True)
 class BaseModel:
-    """Base model with common fields for all models"""
+    """
+    Base model with common fields for all models.
+
+    Models are slotted dataclasses, so overrides must call super() with explicit
+    arguments (zero-argument super() doesn't work in slots=True dataclasses).
+    """
     id: Optional[int] = None
-    created_at: datetime = field(default_factory=datetime.now)
-    updated_at: datetime = field(default_factory=datetime.now)
+    created_at: datetime = field(default_factory=utcnow)
+    updated_at: datetime = field(default_factory=utcnow)
+
+    @classmethod
+    def _field_info(cls) -> tuple[tuple[str, ...], frozenset[str]]:
+        """Get (all field names, datetime field names) for this class, computed once per class"""
+        info = cls.__dict__.get('_field_info_cache')
+        if info is None:
+            model_fields = fields(cls)
+            info = (
+                tuple(f.name for f in model_fields),
+                frozenset(f.name for f in model_fields if f.type in _DATETIME_TYPES),
+            )
+            cls._field_info_cache = info
+        return info
 
     def to_dict(self) -> dict:
         """Convert model to dictionary"""
+        names, datetime_names = self._field_info()
         return {
-            key: self._format_datetime(value) if isinstance(value, datetime) else value
-            for key, value in self.__dict__.items()
-            if value is not None
+            name: self._format_datetime(value) if name in datetime_names else value
+            for name in names
+            if (value := getattr(self, name)) is not None
         }
 
     def _format_datetime(self, dt: datetime) -> str:
@@ -25,28 +51,26 @@ class BaseModel:
             # Fallback for non-standard datetime formats
             return str(dt)
 
+    @staticmethod
+    def _parse_datetime(value: str):
+        """Parse an ISO (or 'YYYY-MM-DD HH:MM:SS') string, returning it unchanged if it can't be parsed"""
+        try:
+            return parse_datetime(value)
+        except ValueError:
+            if ' ' not in value:
+                return value
+            try:
+                return datetime.strptime(value, "%Y-%m-%d %H:%M:%S")
+            except ValueError:
+                # Keep as string if parsing fails
+                return value
+
     @classmethod
     def from_dict(cls, data: dict) -> 'BaseModel':
         """Create model instance from dictionary"""
         # Convert string dates to datetime objects
-        if 'created_at' in data and isinstance(data['created_at'], str):
-            try:
-                data['created_at'] = datetime.fromisoformat(data['created_at'])
-            except ValueError:
-                # Try to parse non-ISO format
-                try:
-                    data['created_at'] = datetime.strptime(data['created_at'], "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    # Keep as string if parsing fails
-                    pass
-        if 'updated_at' in data and isinstance(data['updated_at'], str):
-            try:
-                data['updated_at'] = datetime.fromisoformat(data['updated_at'])
-            except ValueError:
-                # Try to parse non-ISO format
-                try:
-                    data['updated_at'] = datetime.strptime(data['updated_at'], "%Y-%m-%d %H:%M:%S")
-                except ValueError:
-                    # Keep as string if parsing fails
-                    pass
-        return cls(**data) 
\ No newline at end of file
+        for name in cls._field_info()[1]:
+            value = data.get(name)
+            if isinstance(value, str):
+                data[name] = cls._parse_datetime(value)
+        return cls(**data)
@@ -2,12 +2,19 @@ from dataclasses import dataclass
 from typing import Optional
 from scrapper.db.models.base import BaseModel
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class CategoryData(BaseModel):
     """Data model for categories"""
     name: str
     parent_id: Optional[int] = None
     path: Optional[str] = None
+    path_depth: Optional[int] = None  # Generated from path by the database
+
+    def to_dict(self) -> dict:
+        """Convert model to dictionary, excluding the generated path_depth column"""
+        data = super(CategoryData, self).to_dict()
+        data.pop('path_depth', None)
+        return data
 
     def get_path_labels(self) -> list[str]:
         """Get category path as list of labels"""
@@ -15,7 +22,7 @@ class CategoryData(BaseModel):
 
     def get_depth(self) -> int:
         """Get category depth in the tree"""
-        return len(self.get_path_labels())
+        return self.path.count('.') + 1 if self.path else 0
 
     def is_root(self) -> bool:
         """Check if category is root level"""
@@ -23,6 +30,8 @@ class CategoryData(BaseModel):
 
     def is_child_of(self, potential_parent_path: str) -> bool:
         """Check if category is child of given parent path"""
-        if not self.path or not potential_parent_path:
+        path = self.path
+        if not path or not potential_parent_path or len(path) <= len(potential_parent_path):
             return False
-        return self.path.startswith(f"{potential_parent_path}.") 
\ No newline at end of file
+        # Compare in place instead of building "<parent>." for every check
+        return path[len(potential_parent_path)] == '.' and path.startswith(potential_parent_path) 
\ No newline at end of file
@@ -0,0 +1,68 @@
+from typing import Dict, Iterator, List, Optional
+from scrapper.db.models.category import CategoryData
+
+class _Node:
+    """Trie node for one ltree path label"""
+    __slots__ = ('category', 'children')
+
+    def __init__(self):
+        self.category: Optional[CategoryData] = None
+        self.children: Dict[str, '_Node'] = {}
+
+class CategoryTrie:
+    """In-memory index of categories by ltree path for O(depth) ancestor/descendant lookups"""
+
+    def __init__(self, categories: Optional[List[CategoryData]] = None):
+        self.root = _Node()
+        for category in categories or ():
+            self.insert(category)
+
+    def insert(self, category: CategoryData) -> None:
+        """Add a category at its path"""
+        if not category.path:
+            return
+        node = self.root
+        for label in category.path.split('.'):
+            node = node.children.setdefault(label, _Node())
+        node.category = category
+
+    def get(self, path: str) -> Optional[CategoryData]:
+        """Get the category stored at an exact path"""
+        node = self._find(path)
+        return node.category if node else None
+
+    def find_ancestors(self, path: str) -> List[CategoryData]:
+        """Get categories above the given path, root first"""
+        ancestors = []
+        node = self.root
+        for label in path.split('.')[:-1]:
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.category is not None:
+                ancestors.append(node.category)
+        return ancestors
+
+    def find_descendants(self, path: str) -> List[CategoryData]:
+        """Get all categories below the given path"""
+        node = self._find(path)
+        return list(self._walk(node)) if node else []
+
+    def _find(self, path: str) -> Optional[_Node]:
+        """Walk to the node for a path, or None if it isn't indexed"""
+        node = self.root
+        for label in path.split('.'):
+            node = node.children.get(label)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _walk(node: _Node) -> Iterator[CategoryData]:
+        """Yield every category under a node (excluding the node itself)"""
+        stack = list(node.children.values())
+        while stack:
+            current = stack.pop()
+            if current.category is not None:
+                yield current.category
+            stack.extend(current.children.values())
@@ -8,4 +8,8 @@ class RetailerType(str, Enum):
 class Currency(str, Enum):
     """Enum for currencies"""
     HUF = "HUF"
-    CZK = "CZK" 
\ No newline at end of file
+    CZK = "CZK"
+
+# Value -> member lookups, cheaper than Enum.__call__ on per-row paths
+RETAILER_TYPE_BY_VALUE = {t.value: t for t in RetailerType}
+CURRENCY_BY_VALUE = {c.value: c for c in Currency}
@@ -1,9 +1,11 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Optional, List, Dict
 from datetime import datetime
-from scrapper.db.models.base import BaseModel
+from ciso8601 import parse_datetime
+from scrapper.db.models.base import BaseModel, utcnow
+from scrapper.db.models.retailer_product import hash_images
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class PricePoint(BaseModel):
     """Model for price history data points"""
     retailer_product_id: int
@@ -11,28 +13,29 @@ class PricePoint(BaseModel):
     currency: Optional[str] = None
     stock_info: List[Dict] = field(default_factory=list)
     offers: List[Dict] = field(default_factory=list)
-    scraped_at: datetime = field(default_factory=datetime.now)
+    images_sha: Optional[str] = None  # Hash of the product's image list, see RetailerProduct.images_hash
+    scraped_at: datetime = field(default_factory=utcnow)
 
     @classmethod
     def from_scraped_item(cls, item, retailer_product_id: int) -> 'PricePoint':
         """Create PricePoint from scraped item"""
         # Handle timestamp conversion
-        scraped_at = datetime.now()
+        scraped_at = utcnow()
         if 'timestamp' in item:
             timestamp_str = item['timestamp']
             try:
                 if isinstance(timestamp_str, str):
-                    # Try ISO format first
-                    if 'T' in timestamp_str:
-                        scraped_at = datetime.fromisoformat(timestamp_str)
-                    else:
+                    # ISO format with 'T' or space separator
+                    try:
+                        scraped_at = parse_datetime(timestamp_str)
+                    except ValueError:
                         # Try common format like '2023-12-25 14:30:00'
                         scraped_at = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
                 elif isinstance(timestamp_str, datetime):
                     scraped_at = timestamp_str
             except (ValueError, TypeError):
                 # Use current time if parsing fails
-                scraped_at = datetime.now()
+                scraped_at = utcnow()
         
         return cls(
             retailer_product_id=retailer_product_id,
@@ -40,19 +43,19 @@ class PricePoint(BaseModel):
             currency=item.get('currency'),
             stock_info=item.get('stock_info', []),
             offers=item.get('offers', []),
+            images_sha=hash_images(item.get('images')),
             scraped_at=scraped_at
         )
 
     def to_dict(self) -> dict:
         """Convert model to dictionary, excluding updated_at field"""
-        result = {}
-        for key, value in self.__dict__.items():
-            # Skip updated_at field as it doesn't exist in price_history table
-            if key == 'updated_at':
-                continue
-            if value is not None:
-                if isinstance(value, datetime):
-                    result[key] = self._format_datetime(value)
-                else:
-                    result[key] = value
-        return result
+        format_datetime = self._format_datetime
+        return {
+            key: format_datetime(value) if key in _DATETIME_FIELDS else value
+            for key in _DICT_FIELDS
+            if (value := getattr(self, key)) is not None
+        }
+
+# updated_at doesn't exist in the price_history table
+_DICT_FIELDS = tuple(f.name for f in fields(PricePoint) if f.name != 'updated_at')
+_DATETIME_FIELDS = PricePoint._field_info()[1]
@@ -4,7 +4,7 @@ from typing import Optional
 from scrapper.items import ProductItem
 from scrapper.db.models.base import BaseModel
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ProductData(BaseModel):
     """Data model for products"""
     name: str
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional
 from scrapper.db.models.base import BaseModel
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ProductRetailerData(BaseModel):
     """Association table for products and retailers (many-to-many)"""
     product_id: int
@@ -1,9 +1,9 @@
 from dataclasses import dataclass
 from typing import Optional
 from scrapper.db.models.base import BaseModel
-from scrapper.db.models.enums import RetailerType
+from scrapper.db.models.enums import RetailerType, RETAILER_TYPE_BY_VALUE
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class RetailerData(BaseModel):
     """Data model for retailers"""
     name: str
@@ -14,12 +14,12 @@ class RetailerData(BaseModel):
     def from_dict(cls, data: dict) -> 'RetailerData':
         """Create RetailerData instance from dictionary"""
         if 'type' in data:
-            data['type'] = RetailerType(data['type'])
-        return super().from_dict(data)
+            data['type'] = RETAILER_TYPE_BY_VALUE[data['type']]
+        return super(RetailerData, cls).from_dict(data)
 
     def to_dict(self) -> dict:
         """Convert RetailerData to dictionary"""
-        data = super().to_dict()
+        data = super(RetailerData, self).to_dict()
         if self.type:
             data['type'] = self.type.value
         return data 
\ No newline at end of file
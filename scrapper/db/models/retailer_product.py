@@ -1,9 +1,16 @@
+import hashlib
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from datetime import datetime
-from scrapper.db.models.base import BaseModel
+from scrapper.db.models.base import BaseModel, utcnow
 
-@dataclass(kw_only=True)
+def hash_images(images: Optional[List[str]]) -> Optional[str]:
+    """SHA-256 of an image URL list, in Postgres bytea hex input form ('\\x...')"""
+    if not images:
+        return None
+    return '\\x' + hashlib.sha256('|'.join(images).encode('utf-8')).hexdigest()
+
+@dataclass(kw_only=True, slots=True)
 class RetailerProduct(BaseModel):
     """Model for retailer-specific product data"""
     retailer_id: int
@@ -19,39 +26,48 @@ class RetailerProduct(BaseModel):
     stock_info: List[Dict] = field(default_factory=list)
     specifications: Dict = field(default_factory=dict)
     images: List[str] = field(default_factory=list)
+    images_hash: Optional[str] = None
     variants: List[Dict] = field(default_factory=list)
     retailer_metadata: Dict = field(default_factory=dict)
     is_active: bool = True
     last_scraped_at: Optional[datetime] = None
     last_successful_scrape_at: Optional[datetime] = None
     scrape_error_count: int = 0
+    name_tsv: Optional[str] = None  # Generated from name by the database
+
+    def to_dict(self) -> dict:
+        """Convert model to dictionary, excluding the generated name_tsv column"""
+        data = super(RetailerProduct, self).to_dict()
+        data.pop('name_tsv', None)
+        return data
 
     @classmethod
     def from_scraped_item(cls, item, retailer_id: int) -> 'RetailerProduct':
         """Create RetailerProduct from scraped item"""
-        # Extract brand from item or specs
-        brand = item.get('brand')
-        if not brand and item.get('specs'):
-            brand = item.get('specs', {}).get('brand')
-        
+        specs = item.get('specs') or {}
+        images = item.get('images', [])
+        now = utcnow()
+
         return cls(
             retailer_id=retailer_id,
             url=item['url'],
             name=item['product_name'],
             retailer_sku=item.get('product_id'),
-            brand=brand,
-            description=item.get('specs', {}).get('description'),
+            # Extract brand from item or specs
+            brand=item.get('brand') or specs.get('brand'),
+            description=specs.get('description'),
             current_price=item.get('price'),
             currency=item.get('currency'),
             stock_info=item.get('stock_info', []),
-            specifications=item.get('specs', {}),
-            images=item.get('images', []),
+            specifications=specs,
+            images=images,
+            images_hash=hash_images(images),
             variants=item.get('variants', []),
             retailer_metadata={
                 'rating': item.get('rating'),
                 'review_count': item.get('review_count'),
                 'offers': item.get('offers', [])
             },
-            last_scraped_at=datetime.now(),
-            last_successful_scrape_at=datetime.now() if item.get('success') else None
+            last_scraped_at=now,
+            last_successful_scrape_at=now if item.get('success') else None
         )
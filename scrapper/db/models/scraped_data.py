@@ -1,12 +1,13 @@
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict
 from datetime import datetime
+from ciso8601 import parse_datetime
 
 from scrapper.items import ProductItem
-from scrapper.db.models.base import BaseModel
-from scrapper.db.models.enums import Currency
+from scrapper.db.models.base import BaseModel, utcnow
+from scrapper.db.models.enums import Currency, CURRENCY_BY_VALUE
 
-@dataclass(kw_only=True)
+@dataclass(kw_only=True, slots=True)
 class ScrapedData(BaseModel):
     """Data model for scraped product data"""
     url: str
@@ -24,31 +25,32 @@ class ScrapedData(BaseModel):
     delivery_info: Dict = field(default_factory=dict)
     offers: List[Dict] = field(default_factory=list)
     extended_info: Dict = field(default_factory=dict)
-    scraped_at: datetime = field(default_factory=datetime.now)
+    scraped_at: datetime = field(default_factory=utcnow)
     error_info: Optional[Dict] = None
 
     @classmethod
     def from_scraped_item(cls, item: ProductItem, retailer_id: int) -> 'ScrapedData':
         """Create ScrapedData from scraped ProductItem"""
+        specs = item.get('specs') or {}
         return cls(
             url=item['url'],
             image_urls=item.get('image_urls') or item.get('images') or None,
             retailer_id=retailer_id,
             name=item['product_name'],
             success=item.get('success', False),
-            brand=item.get('specs', {}).get('brand', None),
+            brand=specs.get('brand'),
             price=item.get('price', None),
-            currency=Currency(item.get('currency')) if item.get('currency') else None,
+            currency=CURRENCY_BY_VALUE.get(item.get('currency')),
             stock_info=item.get('stock_info', []),
-            offers=[offer for offer in item.get('offers', [])],
-            extended_info=item.get('specs', {}),
-            scraped_at=datetime.fromisoformat(item['timestamp']),
+            offers=item.get('offers') or [],
+            extended_info=specs,
+            scraped_at=parse_datetime(item['timestamp']),
             error_info=item.get('error_info')
         )
 
     def to_dict(self) -> dict:
         """Convert ScrapedData to dictionary"""
-        data = super().to_dict()
+        data = super(ScrapedData, self).to_dict()
         if self.currency:
             data['currency'] = self.currency.value
         return data 
\ No newline at end of file
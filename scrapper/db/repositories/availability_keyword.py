@@ -7,27 +7,27 @@ class AvailabilityKeywordRepository(BaseRepository[AvailabilityKeyword]):
     """Repository for managing availability keywords."""
     
     def __init__(self, supabase: AsyncClient):
-        super().__init__(supabase, "products", AvailabilityKeyword)
+        super().__init__(supabase, "availability_keywords", AvailabilityKeyword)
 
 
     async def create(self, keyword: AvailabilityKeyword) -> AvailabilityKeyword:
-        """Create a new availability keyword entry."""
-        response = await self.supabase.table(self.table).insert({
-            'retailer_id': keyword.retailer_id,
-            'keyword': keyword.keyword,
-            'language': keyword.language,
-            'indicates_in_stock': keyword.indicates_in_stock,
-            'first_seen_at': keyword.first_seen_at.isoformat() if keyword.first_seen_at else None,
-            'last_seen_at': keyword.last_seen_at.isoformat() if keyword.last_seen_at else None,
-            'occurrence_count': keyword.occurrence_count,
-            'is_configured': keyword.is_configured
+        """Create an availability keyword entry, or bump its counters if it exists."""
+        response = await self.supabase.rpc('upsert_availability_keyword', {
+            'p_retailer_id': keyword.retailer_id,
+            'p_keyword': keyword.keyword,
+            'p_language': keyword.language,
+            'p_indicates_in_stock': keyword.indicates_in_stock,
+            'p_first_seen_at': keyword.first_seen_at.isoformat() if keyword.first_seen_at else None,
+            'p_last_seen_at': keyword.last_seen_at.isoformat() if keyword.last_seen_at else None,
+            'p_occurrence_count': keyword.occurrence_count,
+            'p_is_configured': keyword.is_configured
         }).execute()
         
         return AvailabilityKeyword.from_row(response.data[0])
 
     async def get_by_retailer(self, retailer_id: int) -> List[AvailabilityKeyword]:
         """Get all availability keywords for a retailer."""
-        response = await self.supabase.table(self.table)\
+        response = await self.supabase.table(self.table_name)\
             .select('*')\
             .eq('retailer_id', retailer_id)\
             .execute()
@@ -36,17 +36,18 @@ class AvailabilityKeywordRepository(BaseRepository[AvailabilityKeyword]):
 
     async def get_by_retailer_and_keyword(self, retailer_id: int, keyword: str) -> Optional[AvailabilityKeyword]:
         """Get a specific availability keyword for a retailer."""
-        response = await self.supabase.table(self.table)\
+        response = await self.supabase.table(self.table_name)\
             .select('*')\
             .eq('retailer_id', retailer_id)\
             .eq('keyword', keyword)\
+            .limit(1)\
             .execute()
         
         return AvailabilityKeyword.from_row(response.data[0]) if response.data else None
 
     async def update_configuration(self, id: int, indicates_in_stock: bool) -> AvailabilityKeyword:
         """Update the configuration of an availability keyword."""
-        response = await self.supabase.table(self.table)\
+        response = await self.supabase.table(self.table_name)\
             .update({
                 'indicates_in_stock': indicates_in_stock,
                 'is_configured': True
@@ -58,7 +59,7 @@ class AvailabilityKeywordRepository(BaseRepository[AvailabilityKeyword]):
 
     async def get_unconfigured(self) -> List[AvailabilityKeyword]:
         """Get all unconfigured availability keywords."""
-        response = await self.supabase.table(self.table)\
+        response = await self.supabase.table(self.table_name)\
             .select('*')\
             .eq('is_configured', False)\
             .execute()
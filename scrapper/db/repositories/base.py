@@ -1,6 +1,7 @@
 from typing import TypeVar, Generic, Optional, List, Type
 from supabase import AsyncClient
 from scrapper.db.models import BaseModel
+from scrapper.db.models.base import utcnow
 
 T = TypeVar('T', bound=BaseModel)
 
@@ -18,15 +19,24 @@ class BaseRepository(Generic[T]):
         result = await self.supabase.table(self.table_name).insert(data).execute()
         return self.model_class.from_dict(result.data[0])
 
+    async def bulk_create(self, models: List[T]) -> int:
+        """Create many records in a single request. Returns the number of rows written."""
+        if not models:
+            return 0
+        data = [model.to_dict() for model in models]
+        result = await self.supabase.table(self.table_name).insert(data).execute()
+        return len(result.data)
+
     async def get_by_id(self, id: int) -> Optional[T]:
         """Get record by ID"""
-        result = await self.supabase.table(self.table_name).select("*").eq("id", id).execute()
+        result = await self.supabase.table(self.table_name).select("*").eq("id", id).limit(1).execute()
         return self.model_class.from_dict(result.data[0]) if result.data else None
 
     async def update(self, model: T) -> T:
         """Update an existing record"""
         if not model.id:
             raise ValueError("Model ID is required for update")
+        model.updated_at = utcnow()
         data = model.to_dict()
         result = await self.supabase.table(self.table_name).update(data).eq("id", model.id).execute()
         return self.model_class.from_dict(result.data[0])
@@ -36,14 +46,14 @@ class BaseRepository(Generic[T]):
         result = await self.supabase.table(self.table_name).delete().eq("id", id).execute()
         return bool(result.data)
 
-    async def list_all(self) -> List[T]:
-        """Get all records"""
-        result = await self.supabase.table(self.table_name).select("*").execute()
+    async def list_all(self, columns: str = "*") -> List[T]:
+        """Get all records, optionally projecting to a comma-separated column list"""
+        result = await self.supabase.table(self.table_name).select(columns).execute()
         return [self.model_class.from_dict(item) for item in result.data]
 
-    async def find_by(self, **filters) -> List[T]:
-        """Find records by filters"""
-        query = self.supabase.table(self.table_name).select("*")
+    async def find_by(self, columns: str = "*", **filters) -> List[T]:
+        """Find records by filters, optionally projecting to a comma-separated column list"""
+        query = self.supabase.table(self.table_name).select(columns)
         for field, value in filters.items():
             query = query.eq(field, value)
         result = await query.execute()
@@ -54,5 +64,5 @@ class BaseRepository(Generic[T]):
         query = self.supabase.table(self.table_name).select("id")
         for field, value in filters.items():
             query = query.eq(field, value)
-        result = await query.execute()
+        result = await query.limit(1).execute()
         return bool(result.data) 
\ No newline at end of file
@@ -1,17 +1,37 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from supabase import AsyncClient
 from scrapper.db.repositories import BaseRepository
-from scrapper.db.models import CategoryData
+from scrapper.db.models import CategoryData, CategoryTrie
 
 class CategoryRepository(BaseRepository[CategoryData]):
     """Repository for category operations with ltree support"""
 
     def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "categories", CategoryData)
+        # Category id -> ltree path, so sibling inserts don't refetch their parent
+        self._path_cache: Dict[int, Optional[str]] = {}
+
+    def clear_cache(self) -> None:
+        """Forget cached category paths"""
+        self._path_cache.clear()
+
+    async def _get_parent_path(self, parent_id: int) -> Optional[str]:
+        """Get the path of a parent category, fetching it only on a cache miss"""
+        if parent_id in self._path_cache:
+            return self._path_cache[parent_id]
+        parent = await self.get_by_id(parent_id)
+        if not parent:
+            raise ValueError(f"Parent category with id {parent_id} not found")
+        self._path_cache[parent_id] = parent.path
+        return parent.path
+
+    async def build_trie(self) -> CategoryTrie:
+        """Load every category into an in-memory path trie for repeated tree lookups"""
+        return CategoryTrie(await self.list_all())
 
     async def get_by_path(self, path: str) -> Optional[CategoryData]:
         """Get category by ltree path"""
-        result = await self.supabase.table(self.table_name).select("*").eq("path", path).execute()
+        result = await self.supabase.table(self.table_name).select("*").eq("path", path).limit(1).execute()
         return CategoryData.from_dict(result.data[0]) if result.data else None
 
     async def get_children(self, parent_id: int) -> List[CategoryData]:
@@ -21,14 +41,12 @@ class CategoryRepository(BaseRepository[CategoryData]):
 
     async def get_descendants(self, path: str) -> List[CategoryData]:
         """Get all descendant categories using ltree"""
-        query = f"path <@ '{path}'"
-        result = await self.supabase.table(self.table_name).select("*").filter("path", "neq", path).filter("path", "like", f"{path}.%").execute()
+        result = await self.supabase.rpc('category_descendants', {'p': path}).execute()
         return [CategoryData.from_dict(item) for item in result.data]
 
     async def get_ancestors(self, path: str) -> List[CategoryData]:
         """Get all ancestor categories using ltree"""
-        query = f"path @> '{path}'"
-        result = await self.supabase.table(self.table_name).select("*").filter("path", "neq", path).filter("path", "like", f"%.{path}").execute()
+        result = await self.supabase.rpc('category_ancestors', {'p': path}).execute()
         return [CategoryData.from_dict(item) for item in result.data]
 
     async def get_siblings(self, category_id: int) -> List[CategoryData]:
@@ -47,14 +65,15 @@ class CategoryRepository(BaseRepository[CategoryData]):
     async def create(self, model: CategoryData) -> CategoryData:
         """Create a new category with proper path"""
         if model.parent_id:
-            parent = await self.get_by_id(model.parent_id)
-            if not parent:
-                raise ValueError(f"Parent category with id {model.parent_id} not found")
-            model.path = f"{parent.path}.{model.id}" if model.id else parent.path
+            parent_path = await self._get_parent_path(model.parent_id)
+            model.path = f"{parent_path}.{model.id}" if model.id else parent_path
         else:
             model.path = str(model.id) if model.id else None
         
-        return await super().create(model)
+        created = await super().create(model)
+        if created.id:
+            self._path_cache[created.id] = created.path
+        return created
 
     async def update(self, model: CategoryData) -> CategoryData:
         """Update category with path recalculation if parent changed"""
@@ -68,17 +87,22 @@ class CategoryRepository(BaseRepository[CategoryData]):
         # Recalculate path if parent changed
         if current.parent_id != model.parent_id:
             if model.parent_id:
-                parent = await self.get_by_id(model.parent_id)
-                if not parent:
-                    raise ValueError(f"Parent category with id {model.parent_id} not found")
-                model.path = f"{parent.path}.{model.id}"
+                parent_path = await self._get_parent_path(model.parent_id)
+                model.path = f"{parent_path}.{model.id}"
             else:
                 model.path = str(model.id)
+            # The whole subtree moves, so cached paths under it are stale
+            self.clear_cache()
+
+            # Update paths of all descendants in one statement
+            await self.supabase.rpc('reparent_category', {
+                'old_path': current.path,
+                'new_path': model.path
+            }).execute()
 
-            # Update paths of all descendants
-            descendants = await self.get_descendants(current.path)
-            for descendant in descendants:
-                descendant.path = descendant.path.replace(current.path, model.path)
-                await super().update(descendant)
+        return await super().update(model)
 
-        return await super().update(model) 
\ No newline at end of file
+    async def delete(self, id: int) -> bool:
+        """Delete a category and forget cached paths"""
+        self.clear_cache()
+        return await super().delete(id)
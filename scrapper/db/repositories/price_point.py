@@ -1,11 +1,16 @@
+from decimal import Decimal
 from typing import Optional, List
+import orjson
 from supabase import AsyncClient
+from scrapper.db.config import DATABASE_URL, get_pg_pool
 from scrapper.db.repositories.base import BaseRepository
 from scrapper.db.models.price_point import PricePoint
 
 class PricePointRepository(BaseRepository[PricePoint]):
     """Repository for price history data points"""
 
+    copy_columns = ('retailer_product_id', 'price', 'currency', 'stock_info', 'offers', 'images_sha', 'scraped_at')
+
     def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "price_history", PricePoint)
 
@@ -15,12 +20,46 @@ class PricePointRepository(BaseRepository[PricePoint]):
         result = await self.supabase.table(self.table_name).insert(data).execute()
         return PricePoint.from_dict(result.data[0])
 
+    async def bulk_create(self, models: List[PricePoint]) -> int:
+        """
+        Insert many price points at once. Returns the number of rows written.
+
+        Uses COPY over a direct Postgres connection when DATABASE_URL is configured,
+        otherwise a single PostgREST array insert.
+        """
+        if not models:
+            return 0
+        if DATABASE_URL:
+            return await self._copy(models)
+        data = [model.to_dict() for model in models]
+        result = await self.supabase.table(self.table_name).insert(data).execute()
+        return len(result.data)
+
+    async def _copy(self, models: List[PricePoint]) -> int:
+        """Write price points with COPY through the shared asyncpg pool."""
+        records = [
+            (
+                model.retailer_product_id,
+                Decimal(str(model.price)) if model.price is not None else None,
+                model.currency,
+                orjson.dumps(model.stock_info).decode(),
+                orjson.dumps(model.offers).decode(),
+                bytes.fromhex(model.images_sha[2:]) if model.images_sha else None,
+                model.scraped_at,
+            )
+            for model in models
+        ]
+        pool = await get_pg_pool()
+        async with pool.acquire() as conn:
+            await conn.copy_records_to_table(self.table_name, records=records, columns=self.copy_columns)
+        return len(records)
+
     async def get_by_id(self, id: int) -> Optional[PricePoint]:
         """Get a price point by ID."""
-        result = await self.supabase.table(self.table_name).select("*").eq("id", id).execute()
+        result = await self.supabase.table(self.table_name).select("*").eq("id", id).limit(1).execute()
         return PricePoint.from_dict(result.data[0]) if result.data else None
 
-    async def list_by_product(self, retailer_product_id: int, limit: int = 100) -> List[PricePoint]:
+    async def list_by_product(self, retailer_product_id: int, limit: int = 100, columns: str = "*") -> List[PricePoint]:
         """List price points for a retailer product, most recent first."""
-        result = await self.supabase.table(self.table_name).select("*").eq("retailer_product_id", retailer_product_id).order("scraped_at", desc=True).limit(limit).execute()
+        result = await self.supabase.table(self.table_name).select(columns).eq("retailer_product_id", retailer_product_id).order("scraped_at", desc=True).limit(limit).execute()
         return [PricePoint.from_dict(item) for item in result.data]
@@ -12,7 +12,7 @@ class RetailerRepository(BaseRepository[RetailerData]):
 
     async def get_by_name(self, name: str) -> Optional[RetailerData]:
         """Get retailer by name (case-insensitive)"""
-        result = await self.supabase.table(self.table_name).select("*").ilike("name", f"{name}").execute()
+        result = await self.supabase.table(self.table_name).select("*").eq("name", name).limit(1).execute()
         return RetailerData.from_dict(result.data[0]) if result.data else None
 
     async def get_by_type(self, retailer_type: RetailerType) -> list[RetailerData]:
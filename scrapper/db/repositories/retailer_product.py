@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from supabase import AsyncClient
 from scrapper.db.repositories.base import BaseRepository
 from scrapper.db.models.retailer_product import RetailerProduct
@@ -6,6 +6,9 @@ from scrapper.db.models.retailer_product import RetailerProduct
 class RetailerProductRepository(BaseRepository[RetailerProduct]):
     """Repository for retailer product operations"""
 
+    # Narrow projection for listings that don't need the JSONB payload columns
+    summary_columns = "id,retailer_id,url,name,current_price,currency,is_active"
+
     def __init__(self, supabase: AsyncClient):
         super().__init__(supabase, "retailer_products", RetailerProduct)
 
@@ -15,12 +18,13 @@ class RetailerProductRepository(BaseRepository[RetailerProduct]):
             .select("*")\
             .eq("retailer_id", retailer_id)\
             .eq("url", url)\
+            .limit(1)\
             .execute()
         return RetailerProduct.from_dict(result.data[0]) if result.data else None
 
-    async def get_by_retailer(self, retailer_id: int, active_only: bool = True) -> List[RetailerProduct]:
+    async def get_by_retailer(self, retailer_id: int, active_only: bool = True, columns: str = "*") -> List[RetailerProduct]:
         """Get all products for a retailer"""
-        query = self.supabase.table(self.table_name).select("*").eq("retailer_id", retailer_id)
+        query = self.supabase.table(self.table_name).select(columns).eq("retailer_id", retailer_id)
         if active_only:
             query = query.eq("is_active", True)
         result = await query.execute()
@@ -28,6 +32,7 @@ class RetailerProductRepository(BaseRepository[RetailerProduct]):
 
     async def upsert(self, product: RetailerProduct) -> RetailerProduct:
         """Upsert retailer product by (retailer_id, url)"""
+        # Unchanged images (same images_hash as stored) are kept by the database, see migration 0026
         data = product.to_dict()
         update_data = {k: v for k, v in data.items() if k != 'created_at'}
         result = await self.supabase.table(self.table_name)\
@@ -35,11 +40,33 @@ class RetailerProductRepository(BaseRepository[RetailerProduct]):
             .execute()
         return RetailerProduct.from_dict(result.data[0])
 
-    async def search_by_name(self, search_term: str, retailer_id: Optional[int] = None) -> List[RetailerProduct]:
+    async def bulk_upsert(self, products: List[RetailerProduct]) -> List[RetailerProduct]:
+        """Upsert many retailer products by (retailer_id, url), one request per column set"""
+        # A batch may not touch the same row twice, so keep the last product per key
+        latest = {(product.retailer_id, product.url): product for product in products}
+
+        # Bulk upserts share one column list and write NULL for any key a row leaves out,
+        # so rows are grouped by their exact key set (to_dict() omits None values) to keep
+        # absent columns untouched. Unchanged images are kept by the database (migration 0026)
+        batches: Dict[Tuple[str, ...], List[dict]] = {}
+        for product in latest.values():
+            data = product.to_dict()
+            data.pop('created_at', None)
+            batches.setdefault(tuple(sorted(data)), []).append(data)
+
+        saved = []
+        for batch in batches.values():
+            result = await self.supabase.table(self.table_name)\
+                .upsert(batch, on_conflict="retailer_id,url")\
+                .execute()
+            saved.extend(RetailerProduct.from_dict(item) for item in result.data)
+        return saved
+
+    async def search_by_name(self, search_term: str, retailer_id: Optional[int] = None, columns: str = "*") -> List[RetailerProduct]:
         """Search products by name"""
         query = self.supabase.table(self.table_name)\
-            .select("*")\
-            .textSearch("name", search_term)
+            .select(columns)\
+            .text_search("name_tsv", search_term, {"type": "plain", "config": "english"})
         if retailer_id:
             query = query.eq("retailer_id", retailer_id)
         result = await query.execute()
@@ -8,12 +8,18 @@ from scrapy import signals
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+import asyncio
 import logging
-import time
 import random
+from types import MappingProxyType
+from typing import Optional
 from scrapy.http import HtmlResponse
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
 from selenium.webdriver.firefox.options import Options
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
 
 
 class ScrapperSpiderMiddleware:
@@ -110,47 +116,70 @@ class ScrapperDownloaderMiddleware:
         spider.logger.info("Spider opened: %s" % spider.name)
 
 
+# Cloudflare's challenge page shows this near the top of a small document, so
+# only the start of each body is searched
+CF_CHALLENGE_MARKER = b'Enable JavaScript and cookies to continue'
+CF_CHALLENGE_SCAN_BYTES = 16384
+
+# Browser-like headers sent when retrying a challenged request
+CF_RETRY_HEADERS = MappingProxyType({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:136.0) Gecko/20100101 Firefox/136.0',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Sec-Fetch-User': '?1',
+})
+
+
 class CloudflareMiddleware:
     """Middleware to handle Cloudflare's anti-bot protection."""
     
     def __init__(self, crawler):
         self.crawler = crawler
+        self.max_retry_times = crawler.settings.getint('CLOUDFLARE_RETRY_TIMES', 3)
         self.logger = logging.getLogger(__name__)
         
     @classmethod
     def from_crawler(cls, crawler):
         return cls(crawler)
         
-    def process_response(self, request, response, spider):
+    async def process_response(self, request, response, spider):
         # Check if we hit a Cloudflare challenge page
-        if b'Enable JavaScript and cookies to continue' in response.body:
+        if response.body.find(CF_CHALLENGE_MARKER, 0, CF_CHALLENGE_SCAN_BYTES) != -1:
+            retry_times = request.meta.get('cf_retry_times', 0)
+            if retry_times >= self.max_retry_times:
+                self.logger.error(f"Cloudflare protection still present on {request.url} after {retry_times} retries, giving up")
+                return response
             self.logger.warning(f"Cloudflare protection detected on {request.url}")
-            # Add a delay before retrying
-            time.sleep(random.uniform(5, 10))
+            # Add a delay before retrying, without blocking other downloads
+            await asyncio.sleep(random.uniform(5, 10))
             # Set special headers and cookies for retry
-            request.headers.update({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:136.0) Gecko/20100101 Firefox/136.0',
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-                'Accept-Language': 'en-US,en;q=0.5',
-                'Accept-Encoding': 'gzip, deflate, br',
-                'Connection': 'keep-alive',
-                'Upgrade-Insecure-Requests': '1',
-                'Sec-Fetch-Dest': 'document',
-                'Sec-Fetch-Mode': 'navigate',
-                'Sec-Fetch-Site': 'none',
-                'Sec-Fetch-User': '?1',
-            })
-            # Don't forget to return the request to retry it
-            return request
+            request.headers.update(CF_RETRY_HEADERS)
+            # Don't forget to return the request to retry it (bypassing the dupe filter)
+            retry_request = request.replace(dont_filter=True)
+            retry_request.meta['cf_retry_times'] = retry_times + 1
+            # Fetch the retry live rather than from HTTPCACHE
+            retry_request.meta['dont_cache'] = True
+            return retry_request
         return response
 
 
 class SeleniumMiddleware:
-    """Middleware to handle JavaScript-rendered pages using Selenium."""
+    """Middleware to handle JavaScript-rendered pages using a pool of Selenium browsers."""
     
     def __init__(self, crawler):
         self.crawler = crawler
-        self.driver = None
+        self.pool_size = crawler.settings.getint('SELENIUM_POOL_SIZE', 2)
+        self.wait_timeout = crawler.settings.getfloat('SELENIUM_WAIT_TIMEOUT', 15)
+        self.drivers = []  # Every live driver, so they can all be shut down
+        self.idle_drivers = []  # Live drivers not currently rendering
+        self.slots = asyncio.Semaphore(self.pool_size)  # One per driver in use or starting
+        self.closed = False
         self.logger = logging.getLogger(__name__)
         
     @classmethod
@@ -159,43 +188,101 @@ class SeleniumMiddleware:
         crawler.signals.connect(middleware.spider_closed, signal=signals.spider_closed)
         return middleware
     
-    def _setup_driver(self):
-        if not self.driver:
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--window-size=1920,1080')
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:136.0) Gecko/20100101 Firefox/136.0')
-            
-            self.driver = webdriver.Firefox(options=options)
-            self.driver.set_page_load_timeout(30)
+    def _setup_driver(self) -> webdriver.Firefox:
+        options = Options()
+        options.add_argument('--headless')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--window-size=1920,1080')
+        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:136.0) Gecko/20100101 Firefox/136.0')
+        
+        driver = webdriver.Firefox(options=options)
+        driver.set_page_load_timeout(30)
+        return driver
+
+    def _quit_driver(self, driver: webdriver.Firefox) -> None:
+        """Shut a driver down, ignoring errors from browsers that are already gone"""
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.debug(f"Error quitting Selenium driver: {str(e)}")
+
+    async def _acquire_driver(self) -> webdriver.Firefox:
+        """Take an idle driver, starting a new one while the pool isn't full"""
+        await self.slots.acquire()
+        if self.idle_drivers:
+            return self.idle_drivers.pop()
+        try:
+            driver = await asyncio.to_thread(self._setup_driver)
+        except Exception:
+            self.slots.release()
+            raise
+        self.drivers.append(driver)
+        return driver
+
+    async def _release_driver(self, driver: webdriver.Firefox, healthy: bool) -> None:
+        """Return a driver to the pool, or quit it if it broke or the spider has closed"""
+        if healthy and not self.closed:
+            self.idle_drivers.append(driver)
+        else:
+            # Freeing the slot lets the next request start a fresh driver
+            if driver in self.drivers:
+                self.drivers.remove(driver)
+            await asyncio.to_thread(self._quit_driver, driver)
+        self.slots.release()
+
+    def _render(self, driver: webdriver.Firefox, url: str, ready_selector: Optional[str]) -> str:
+        """Load a page and wait until it's ready (runs in a worker thread)"""
+        driver.get(url)
+        wait = WebDriverWait(driver, self.wait_timeout)
+        try:
+            if ready_selector:
+                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ready_selector)))
+            else:
+                wait.until(lambda d: d.execute_script('return document.readyState') == 'complete')
+        except TimeoutException:
+            self.logger.warning(f"Selenium wait timed out for {url}, using page as loaded")
+        return driver.page_source
     
-    def process_request(self, request, spider):
+    async def process_request(self, request, spider):
         if not request.meta.get('selenium', False):
             return None
             
         try:
-            if not self.driver:
-                self._setup_driver()
-                
-            self.driver.get(request.url)
-            # Wait for the page to load
-            time.sleep(5)  # Give JavaScript some time to execute
-            
-            body = self.driver.page_source
+            driver = await self._acquire_driver()
+        except Exception as e:
+            self.logger.error(f"Selenium error for {request.url}: {str(e)}")
+            return None
+
+        healthy = True
+        try:
+            ready_selector = request.meta.get('selenium_ready_selector') or getattr(spider, 'ready_selector', None)
+            body = await asyncio.to_thread(self._render, driver, request.url, ready_selector)
             return HtmlResponse(
                 url=request.url,
                 body=body.encode('utf-8'),
                 encoding='utf-8',
                 request=request
             )
+        except TimeoutException as e:
+            # A slow page load, the browser itself is still usable
+            self.logger.error(f"Selenium error for {request.url}: {str(e)}")
+            return None
+        except WebDriverException as e:
+            healthy = False
+            self.logger.error(f"Selenium error for {request.url}, discarding driver: {str(e)}")
+            return None
         except Exception as e:
             self.logger.error(f"Selenium error for {request.url}: {str(e)}")
             return None
+        finally:
+            await self._release_driver(driver, healthy)
     
     def spider_closed(self):
         """Clean up when spider closes."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        # Drivers still rendering are quit by _release_driver once their render finishes
+        self.closed = True
+        for driver in self.idle_drivers:
+            self.drivers.remove(driver)
+            self._quit_driver(driver)
+        self.idle_drivers = []
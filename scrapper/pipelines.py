@@ -4,64 +4,119 @@
 # See: https://docs.scrapy.org/en/latest/topics/item-pipeline.html
 
 
-# useful for handling different item types with a single interface
-from itemadapter import ItemAdapter
-import re
 import logging
-from typing import Optional, Dict, Any, List
-from datetime import datetime
+import time
+from functools import lru_cache
+from itertools import islice
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
+import asyncpg
+from postgrest.exceptions import APIError
 from scrapy.exceptions import DropItem
 from scrapy import Spider
+from scrapy.utils.defer import deferred_from_coro
 from scrapper.items import ProductItem, VariantItem
-from scrapper.db.config import get_supabase_client
+from scrapper.db.config import get_supabase_client, close_pg_pool
 
 logger = logging.getLogger(__name__)
 
+class _PriceCharTable(dict):
+    """str.translate table deleting everything except digits and , . (filled in as characters are seen)"""
+
+    def __missing__(self, code: int) -> Optional[int]:
+        char = chr(code)
+        keep = code if char in ',.' or char.isdecimal() else None
+        self[code] = keep
+        return keep
+
+_PRICE_CHARS = _PriceCharTable()
+
+@lru_cache(maxsize=4096)
+def _clean_text(text: str) -> str:
+    """Clean and normalize text fields (memoized, since colors, sellers and statuses repeat across items)."""
+    if not text:
+        return ""
+    # Remove extra whitespace and normalize
+    return " ".join(text.split())
+
+# Spider name -> retailers.id
+RETAILER_IDS = MappingProxyType({
+    'datart': 1,
+    'euronics': 2,
+    'mediamarkt': 3,
+    'pilulka': 4,
+    'planeo': 5,
+    'telekom': 6,
+    'zbozi': 7,
+    'alza': 8,
+    'alza_api': 8
+})
+
+# SQLSTATE classes for data exceptions (22) and integrity constraint violations (23)
+ROW_ERROR_SQLSTATE_CLASSES = ('22', '23')
+
+def _is_row_error(error: Exception) -> bool:
+    """Whether a batch write failed because of a row's data rather than the connection or auth"""
+    if isinstance(error, APIError):
+        code = error.code
+    elif isinstance(error, asyncpg.PostgresError):
+        code = error.sqlstate
+    else:
+        return False
+    return isinstance(code, str) and code.startswith(ROW_ERROR_SQLSTATE_CLASSES)
+
+# Fields an item must have to pass validation
+REQUIRED_FIELDS = ('url', 'website', 'product_name')
+
 class ProductValidationPipeline:
     """Pipeline for validating and cleaning product data."""
     
     def __init__(self):
         self.items_processed = 0
         self.items_dropped = 0
+        # Formatted default timestamp, reused for every item within the same second
+        self._timestamp_epoch = 0
+        self._timestamp_str = ""
 
     def process_item(self, item: ProductItem, spider) -> ProductItem:
-        adapter = ItemAdapter(item)
-        # Validate required fields
-        required_fields = ['url', 'website', 'product_name']
-        for field in required_fields:
-            if not adapter.get(field):
-                self.items_dropped += 1
-                raise DropItem(f"Missing required field: {field}")
+        # ProductItem is dict-backed, so it's read and written directly rather than through ItemAdapter
+        # Validate required fields (the loop only runs to name the missing one)
+        get = item.get
+        if not (get('url') and get('website') and get('product_name')):
+            for field in REQUIRED_FIELDS:
+                if not get(field):
+                    self.items_dropped += 1
+                    raise DropItem(f"Missing required field: {field}")
 
         # Clean and process the data
         try:
             # Clean product name
-            if adapter.get('product_name'):
-                adapter['product_name'] = self._clean_text(adapter['product_name'])
+            if item.get('product_name'):
+                item['product_name'] = _clean_text(item['product_name'])
 
             # Process variants if present
-            if adapter.get('variants'):
-                adapter['variants'] = self._process_variants(adapter['variants'])
+            if item.get('variants'):
+                item['variants'] = self._process_variants(item['variants'])
             # Process selected variant
-            if adapter.get('selected_variant'):
-                adapter['selected_variant'] = self._process_variant(adapter['selected_variant'])
+            if item.get('selected_variant'):
+                item['selected_variant'] = self._process_variant(item['selected_variant'])
                 # Update main product price from selected variant
-                if 'offer' in adapter['selected_variant']:
-                    offer = adapter['selected_variant']['offer']
-                    adapter['price'] = offer.get('price')
-                    adapter['raw_price'] = offer.get('raw_price')
+                if 'offer' in item['selected_variant']:
+                    offer = item['selected_variant']['offer']
+                    item['price'] = offer.get('price')
+                    item['raw_price'] = offer.get('raw_price')
             # Clean stock info
-            if adapter.get('stock_info'):
-                adapter['stock_info'] = [self._clean_stock_info(info) for info in adapter['stock_info']]
+            if item.get('stock_info'):
+                item['stock_info'] = [self._clean_stock_info(info) for info in item['stock_info']]
             # Validate image URLs
-            if adapter.get('images'):
-                adapter['images'] = self._validate_image_urls(adapter['images'])
+            if item.get('images'):
+                item['images'] = self._validate_image_urls(item['images'])
             # Clean specs
-            if adapter.get('specs'):
-                adapter['specs'] = self._clean_specs(adapter['specs'])
+            if item.get('specs'):
+                item['specs'] = self._clean_specs(item['specs'])
             # Ensure timestamp is in correct format
-            if not adapter.get('timestamp'):
-                adapter['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if not item.get('timestamp'):
+                item['timestamp'] = self._current_timestamp()
 
             self.items_processed += 1
             return item
@@ -71,6 +126,14 @@ class ProductValidationPipeline:
             self.items_dropped += 1
             raise DropItem(f"Error processing item: {str(e)}")
 
+    def _current_timestamp(self) -> str:
+        """Local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+        now = int(time.time())
+        if now != self._timestamp_epoch:
+            self._timestamp_epoch = now
+            self._timestamp_str = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))
+        return self._timestamp_str
+
     def _process_variants(self, variants: List[Dict]) -> List[Dict]:
         """Process and validate a list of variants."""
         processed_variants = []
@@ -94,7 +157,7 @@ class ProductValidationPipeline:
         # Copy basic variant fields
         for field in ['variant_id', 'sku', 'color', 'color_hex', 'storage']:
             if field in variant:
-                processed[field] = self._clean_text(str(variant[field]))
+                processed[field] = _clean_text(str(variant[field]))
         
         # Process offer if present
         if 'offer' in variant:
@@ -103,13 +166,13 @@ class ProductValidationPipeline:
             
             # Process price fields
             if 'price' in offer:
-                processed_offer['price'] = self._extract_price(str(offer['price']))
+                processed_offer['price'] = self._extract_price(offer['price'])
             if 'raw_price' in offer:
-                processed_offer['raw_price'] = self._clean_text(str(offer['raw_price']))
+                processed_offer['raw_price'] = _clean_text(str(offer['raw_price']))
             if 'delivery_price' in offer:
-                processed_offer['delivery_price'] = self._extract_price(str(offer['delivery_price']))
+                processed_offer['delivery_price'] = self._extract_price(offer['delivery_price'])
             if 'total_price' in offer:
-                processed_offer['total_price'] = self._extract_price(str(offer['total_price']))
+                processed_offer['total_price'] = self._extract_price(offer['total_price'])
             
             # Process stock status
             if 'stock_status' in offer:
@@ -118,27 +181,24 @@ class ProductValidationPipeline:
             # Copy seller information
             for field in ['seller_name', 'seller_url']:
                 if field in offer:
-                    processed_offer[field] = self._clean_text(str(offer[field]))
+                    processed_offer[field] = _clean_text(str(offer[field]))
             
             processed['offer'] = processed_offer
         
         return processed
 
-    def _clean_text(self, text: str) -> str:
-        """Clean and normalize text fields."""
-        if not text:
-            return ""
-        # Remove extra whitespace and normalize
-        return " ".join(text.strip().split())
-
-    def _extract_price(self, raw_price: str) -> Optional[float]:
-        """Extract numerical price from raw price string."""
+    def _extract_price(self, raw_price: Union[str, int, float]) -> Optional[float]:
+        """Extract numerical price from raw price string (or pass through an already numeric one)."""
+        # JSON APIs hand over numbers directly; bool is excluded as it isn't a price
+        if type(raw_price) is float or type(raw_price) is int:
+            return float(raw_price)
         if not raw_price:
             return None
+        if not isinstance(raw_price, str):
+            raw_price = str(raw_price)
         
-        # Remove currency symbols and normalize separators
-        price_str = raw_price.replace(" ", "")
-        price_str = re.sub(r'[^\d,.]', '', price_str)
+        # Remove currency symbols and whitespace, keeping digits and separators
+        price_str = raw_price.translate(_PRICE_CHARS)
         
         # Handle different number formats
         try:
@@ -152,28 +212,41 @@ class ProductValidationPipeline:
 
     def _normalize_stock_status(self, status: str) -> str:
         """Normalize stock status to standard values."""
-        return self._clean_text(status).upper()
+        return _clean_text(status).upper()
 
     def _validate_image_urls(self, urls: list) -> list:
-        """Validate and clean image URLs."""
-        valid_urls = []
-        for url in urls:
-            if url and isinstance(url, str):
-                # Basic URL validation
-                if url.startswith(('http://', 'https://')):
-                    valid_urls.append(url.strip())
-        return valid_urls
+        """Validate and clean image URLs, returning the input list itself when nothing changes."""
+        valid_urls = None  # Only copied once a URL is dropped or rewritten
+        for i, url in enumerate(urls):
+            # Basic URL validation
+            if not (isinstance(url, str) and url.startswith(('http://', 'https://'))):
+                if valid_urls is None:
+                    valid_urls = list(urls[:i])
+                continue
+            # Leading whitespace can't pass the prefix check, so only the end needs stripping
+            cleaned = url.strip() if url[-1].isspace() else url
+            if valid_urls is not None:
+                valid_urls.append(cleaned)
+            elif cleaned is not url:
+                valid_urls = list(urls[:i])
+                valid_urls.append(cleaned)
+        return urls if valid_urls is None else valid_urls
 
     def _clean_specs(self, specs: Dict[str, Any]) -> Dict[str, str]:
-        """Clean and validate product specifications."""
-        cleaned_specs = {}
-        for key, value in specs.items():
+        """Clean and validate product specifications, returning the input dict itself when nothing changes."""
+        cleaned_specs = None  # Only copied once an entry is dropped or rewritten
+        for i, (key, value) in enumerate(specs.items()):
+            cleaned_key = cleaned_value = None
             if key and value:
-                cleaned_key = self._clean_text(str(key))
-                cleaned_value = self._clean_text(str(value))
-                if cleaned_key and cleaned_value:
-                    cleaned_specs[cleaned_key] = cleaned_value
-        return cleaned_specs
+                cleaned_key = _clean_text(str(key))
+                cleaned_value = _clean_text(str(value))
+            if cleaned_specs is None:
+                if cleaned_key and cleaned_key == key and cleaned_value == value:
+                    continue
+                cleaned_specs = dict(islice(specs.items(), i))
+            if cleaned_key and cleaned_value:
+                cleaned_specs[cleaned_key] = cleaned_value
+        return specs if cleaned_specs is None else cleaned_specs
 
     def _clean_stock_info(self, stock_info: Dict) -> Dict:
         """Clean and validate stock info dictionary."""
@@ -182,11 +255,11 @@ class ProductValidationPipeline:
         # Clean text fields
         for field in ['status', 'delivery_method', 'delivery_time', 'additional_info']:
             if field in stock_info and stock_info[field]:
-                cleaned[field] = self._clean_text(str(stock_info[field]))
+                cleaned[field] = _clean_text(str(stock_info[field]))
         
         # Clean numeric fields
         if 'delivery_cost' in stock_info and stock_info['delivery_cost'] is not None:
-            cleaned['delivery_cost'] = self._extract_price(str(stock_info['delivery_cost']))
+            cleaned['delivery_cost'] = self._extract_price(stock_info['delivery_cost'])
         
         if 'store_count' in stock_info and stock_info['store_count'] is not None:
             try:
@@ -208,11 +281,18 @@ class ProductValidationPipeline:
 class DatabasePipeline:
 
     """Pipeline for storing retailer product data"""
+
+    # Retailer products are buffered and upserted in batches of this size
+    product_batch_size = 500
+    # Price points are buffered and written to price_history in batches of this size
+    price_point_batch_size = 1000
+
     def __init__(self):
         self.supabase = None
         self.retailer_product_repo = None
         self.price_point_repo = None
-        self.retailer_cache = {}
+        self.pending_products = []
+        self.pending_price_points = []
 
     async def process_item(self, item: ProductItem, spider) -> ProductItem:
         """Process item and store in new schema"""
@@ -224,19 +304,15 @@ class DatabasePipeline:
             self.price_point_repo = PricePointRepository(self.supabase)
 
         try:
-            retailer_id = await self._get_retailer_id(spider)
+            retailer_id = self._get_retailer_id(spider)
             if not retailer_id:
                 return item
 
             from scrapper.db.models.retailer_product import RetailerProduct
-            from scrapper.db.models.price_point import PricePoint
             retailer_product = RetailerProduct.from_scraped_item(item, retailer_id)
-            saved_product = await self.retailer_product_repo.upsert(retailer_product)
-
-            # Store price point for history
-            if (item.get('price') or item.get('stock_info')) and saved_product.id and self.price_point_repo:
-                price_point = PricePoint.from_scraped_item(item, saved_product.id)
-                await self.price_point_repo.create(price_point)
+            self.pending_products.append((item, retailer_product))
+            if len(self.pending_products) >= self.product_batch_size:
+                await self._flush_products()
 
             return item
 
@@ -244,33 +320,72 @@ class DatabasePipeline:
             logger.error(f"Error storing retailer product: {str(e)}")
             return item
 
-    async def _get_retailer_id(self, spider: Spider) -> Optional[int]:
-        """Get retailer ID for spider, using cache to minimize database queries"""
-        if spider.name in self.retailer_cache:
-            return self.retailer_cache[spider.name]
-
-        # Map spider names to retailer IDs directly
-        retailer_mapping = {
-            'datart': 1,
-            'euronics': 2,
-            'mediamarkt': 3,
-            'pilulka': 4,
-            'planeo': 5,
-            'telekom': 6,
-            'zbozi': 7,
-            'alza': 8,
-            'alza_api': 8
-        }
-
-        if spider.name not in retailer_mapping:
-            return None
-        
-        retailer_id = retailer_mapping[spider.name]
-        self.retailer_cache[spider.name] = retailer_id
-        return retailer_id
+    def _get_retailer_id(self, spider: Spider) -> Optional[int]:
+        """Get retailer ID for spider"""
+        return RETAILER_IDS.get(spider.name)
 
-    def close_spider(self, spider: Spider):
-        """Clean up resources when spider closes"""
+    async def _flush_products(self):
+        """Upsert buffered retailer products in one request and queue their price points"""
+        if not self.pending_products or not self.retailer_product_repo:
+            return
+        batch, self.pending_products = self.pending_products, []
+        saved = await self._upsert_products([product for _, product in batch])
+
+        # Store price points for history
+        from scrapper.db.models.price_point import PricePoint
+        ids = {(product.retailer_id, product.url): product.id for product in saved}
+        for item, product in batch:
+            product_id = ids.get((product.retailer_id, product.url))
+            if (item.get('price') or item.get('stock_info')) and product_id:
+                self.pending_price_points.append(PricePoint.from_scraped_item(item, product_id))
+        if len(self.pending_price_points) >= self.price_point_batch_size:
+            await self._flush_price_points()
+
+    async def _upsert_products(self, products: List) -> List:
+        """Bulk upsert retailer products, returning the saved rows"""
+        results = await self._write_batch(self.retailer_product_repo.bulk_upsert, products, "retailer products")
+        return [product for saved in results for product in saved]
+
+    async def _write_batch(self, write: Callable[[List], Awaitable[Any]], rows: List, label: str, retried: bool = False) -> List:
+        """
+        Write rows with one write() call, returning the results of the calls that succeeded.
+
+        Row-level errors split the batch until the bad row is isolated and skipped, so it
+        doesn't lose the rest. Other failures (connection, auth) retry the whole batch once
+        and are then logged once for it.
+        """
+        try:
+            return [await write(rows)]
+        except Exception as e:
+            if not _is_row_error(e):
+                if not retried:
+                    return await self._write_batch(write, rows, label, retried=True)
+                logger.error(f"Error storing {len(rows)} {label}: {str(e)}")
+                return []
+            if len(rows) == 1:
+                logger.error(f"Error storing 1 of the {label}, skipping it: {str(e)}")
+                return []
+        # A failed request writes nothing, so both halves can be resent
+        middle = len(rows) // 2
+        return (await self._write_batch(write, rows[:middle], label, retried)
+                + await self._write_batch(write, rows[middle:], label, retried))
+
+    async def _flush_price_points(self):
+        """Write buffered price points to price_history in one request (split up only if a row fails)"""
+        if not self.pending_price_points or not self.price_point_repo:
+            return
+        batch, self.pending_price_points = self.pending_price_points, []
+        await self._write_batch(self.price_point_repo.bulk_create, batch, "price points")
+
+    async def _close(self):
+        """Flush buffered writes and drop repository references"""
+        await self._flush_products()
+        await self._flush_price_points()
+        await close_pg_pool()
         self.supabase = None
         self.retailer_product_repo = None
         self.price_point_repo = None
+
+    def close_spider(self, spider: Spider):
+        """Flush pending writes and clean up resources when spider closes"""
+        return deferred_from_coro(self._close())
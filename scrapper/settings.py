@@ -7,6 +7,7 @@
 #     https://docs.scrapy.org/en/latest/topics/downloader-middleware.html
 #     https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import importlib.util
 import logging
 from dotenv import load_dotenv
 import scrapy
@@ -83,6 +84,15 @@ DOWNLOADER_MIDDLEWARES = {
     # "scrapy.downloadermiddlewares.httpproxy.HttpProxyMiddleware": 750
 }
 
+# SeleniumMiddleware: number of browsers shared by selenium requests, and how long
+# to wait for the page (or request.meta['selenium_ready_selector']) to be ready
+SELENIUM_POOL_SIZE = 2
+SELENIUM_WAIT_TIMEOUT = 15
+
+# CloudflareMiddleware: how many times a challenged request is retried before the
+# challenge page is passed on as the response
+CLOUDFLARE_RETRY_TIMES = 3
+
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
 #EXTENSIONS = {
@@ -104,16 +114,21 @@ AUTOTHROTTLE_TARGET_CONCURRENCY = 1.0
 # Enable showing throttling stats for every response received:
 #AUTOTHROTTLE_DEBUG = False
 
-# Enable and configure HTTP caching (disabled by default)
+# Enable and configure HTTP caching (disabled by default, set SCRAPER_CACHE=1 to
+# replay unchanged pages from disk while iterating on spiders and pipelines)
 # See https://docs.scrapy.org/en/latest/topics/downloader-middleware.html#httpcache-middleware-settings
-#HTTPCACHE_ENABLED = True
-#HTTPCACHE_EXPIRATION_SECS = 0
-#HTTPCACHE_DIR = "httpcache"
-#HTTPCACHE_IGNORE_HTTP_CODES = []
-#HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
+HTTPCACHE_ENABLED = os.getenv('SCRAPER_CACHE', '0') == '1'
+HTTPCACHE_EXPIRATION_SECS = 3600
+HTTPCACHE_DIR = "httpcache"
+# Never cache Cloudflare challenge responses, or CloudflareMiddleware retries would replay them
+HTTPCACHE_IGNORE_HTTP_CODES = [403, 503]
+HTTPCACHE_STORAGE = "scrapy.extensions.httpcache.FilesystemCacheStorage"
 
 # Set settings whose default value is deprecated to a future-proof value
 TWISTED_REACTOR = "twisted.internet.asyncioreactor.AsyncioSelectorReactor"
+# Run the asyncio reactor on uvloop's libuv loop where it's installed (not available on Windows)
+if importlib.util.find_spec("uvloop"):
+    ASYNCIO_EVENT_LOOP = "uvloop.Loop"
 FEED_EXPORT_ENCODING = "utf-8"
 FEED_EXPORT_INDENT = 2  # Pretty print JSON output
 
@@ -1,9 +1,13 @@
 import scrapy
-import json
+import orjson
 import os
+import time
 from datetime import datetime
 from typing import Any, Dict, List, Set, Optional, Generator
 
+# Number of example product URLs included in the discovery report
+SAMPLE_PRODUCTS_LIMIT = 50
+
 class BaseDiscoverySpider(scrapy.Spider):
     """
     Base class for discovery spiders. Handles common attributes, reporting, and utilities.
@@ -16,9 +20,16 @@ class BaseDiscoverySpider(scrapy.Spider):
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
-        self.discovered_products = set()
+        # Product URLs are deduplicated by their 64-bit string hash, so the full URLs aren't kept alive
+        self._product_hashes = set()
+        # The first few product URLs, kept as examples for the report
+        self.sample_products = []
         self.discovered_categories = set()
-        self.product_urls = []
+        # Discovered product data is streamed to the products file rather than kept in memory
+        self._products_file = None
+        # Formatted timestamp, reused for every call within the same second
+        self._timestamp_epoch = 0
+        self._timestamp_str = ""
         self.discovery_methods = {
             'sitemap': 0,
             'category_traversal': 0,
@@ -36,12 +47,46 @@ class BaseDiscoverySpider(scrapy.Spider):
         """Override in subclass: Check if URL is a category page."""
         raise NotImplementedError
 
+    @property
+    def product_count(self) -> int:
+        """Number of distinct product URLs discovered so far."""
+        return len(self._product_hashes)
+
+    def add_product_url(self, url: str) -> bool:
+        """Mark a product URL as discovered, returning False if it already was."""
+        url_hash = hash(url)
+        if url_hash in self._product_hashes:
+            return False
+        self._product_hashes.add(url_hash)
+        if len(self.sample_products) < SAMPLE_PRODUCTS_LIMIT:
+            self.sample_products.append(url)
+        return True
+
+    def record_product(self, product: Dict[str, Any]) -> None:
+        """Append discovered product data to the products file, written incrementally as a JSON array."""
+        if self._products_file is None:
+            self._products_file = open(self._output_path(self.products_filename), 'wb')
+            self._products_file.write(b'[\n')
+        else:
+            self._products_file.write(b',\n')
+        self._products_file.write(orjson.dumps(product))
+
+    def _output_path(self, filename: str) -> str:
+        """Build the path of an output file from its filename template."""
+        spider_name = getattr(self, 'name', 'discovery_spider')
+        return os.path.join(self.output_folder, filename.format(spider_name=spider_name))
+
     def get_timestamp(self) -> str:
-        return datetime.now().isoformat()
+        """Local time in ISO format, formatted at most once per second."""
+        now = int(time.time())
+        if now != self._timestamp_epoch:
+            self._timestamp_epoch = now
+            self._timestamp_str = datetime.fromtimestamp(now).isoformat()
+        return self._timestamp_str
 
     def closed(self, reason: str) -> None:
         """Generate discovery report and save all discovered product data."""
-        total_products = len(self.discovered_products)
+        total_products = self.product_count
         total_categories = len(self.discovered_categories)
         spider_name = getattr(self, 'name', 'discovery_spider')
         # Prepare report
@@ -54,17 +99,22 @@ class BaseDiscoverySpider(scrapy.Spider):
                 'discovery_methods': self.discovery_methods,
             },
             'discovered_categories': list(self.discovered_categories),
-            'sample_products': list(self.discovered_products)[:50],
+            'sample_products': self.sample_products,
             'finished_at': self.get_timestamp(),
         }
         # Save report
-        report_path = os.path.join(self.output_folder, self.report_filename.format(spider_name=spider_name))
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
-        # Save all discovered product data
-        products_path = os.path.join(self.output_folder, self.products_filename.format(spider_name=spider_name))
-        with open(products_path, 'w', encoding='utf-8') as f:
-            json.dump(self.product_urls, f, indent=2, ensure_ascii=False)
+        report_path = self._output_path(self.report_filename)
+        with open(report_path, 'wb') as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2))
+        # Finish the discovered product data file
+        products_path = self._output_path(self.products_filename)
+        if self._products_file is None:
+            with open(products_path, 'wb') as f:
+                f.write(b'[]\n')
+        else:
+            self._products_file.write(b'\n]\n')
+            self._products_file.close()
+            self._products_file = None
         self.logger.info(f"Discovery completed: {total_products} products, {total_categories} categories")
         self.logger.info(f"Discovery methods: {self.discovery_methods}")
         self.logger.info(f"Reports saved to: {report_path} and {products_path}") 
\ No newline at end of file
@@ -3,8 +3,8 @@
 import logging
 import json
 from abc import ABC, abstractmethod
+from types import MappingProxyType
 from typing import Optional, List, Dict, Any, Generator
-from urllib.parse import urlparse
 import re
 
 import scrapy
@@ -15,6 +15,17 @@ from scrapper.items import ProductItem
 
 logger = logging.getLogger(__name__)
 
+# Malformed seed URLs with a repeated scheme, e.g. 'https://https://example.com'
+DOUBLE_SCHEME_RE = re.compile(r'https?://(https?://)')
+# Host part of a URL that already has an http(s) scheme (same as urlparse().netloc)
+NETLOC_RE = re.compile(r'https?://([^/?#]*)')
+# Meta shared by every start request, alongside its own 'url' (Request copies meta)
+START_REQUEST_META = MappingProxyType({
+    'dont_redirect': False,
+    'handle_httpstatus_list': (403, 503),
+    'download_timeout': 30,
+})
+
 class BaseSpider(scrapy.Spider, ABC):
     """Base spider class with Sentry integration and common functionality."""
     
@@ -33,21 +44,35 @@ class BaseSpider(scrapy.Spider, ABC):
             urls_file (str, optional): Path to file containing URLs (JSON array or one per line)
         """
         super().__init__(*args, **kwargs)
+        # Allowed domains for matching seed URL hosts exactly or as subdomains
+        self._allowed_domain_set = frozenset(self.allowed_domains)
+        self._allowed_domain_suffixes = tuple(f'.{domain}' for domain in self._allowed_domain_set)
+        # Headers are the same for every start request, so they're built once (Request copies them)
+        self._request_headers = self._get_headers()
+        # Plain-text URL file, read lazily by start_requests instead of loaded up front
+        self._urls_file = None
         # Handle URLs from file
         if urls_file:
             try:
                 with open(urls_file, 'r', encoding='utf-8') as f:
-                    try:
-                        # Try to load as JSON array
-                        self.start_urls = json.load(f)
-                        if not isinstance(self.start_urls, list):
-                            raise ValueError("JSON in urls_file must be a list of URLs")
-                        logger.info(f"Loaded {len(self.start_urls)} URLs from JSON file: {urls_file}")
-                    except json.JSONDecodeError:
-                        # Fallback: treat as plain text, one URL per line
-                        f.seek(0)
-                        self.start_urls = [line.strip() for line in f if line.strip()]
-                        logger.info(f"Loaded {len(self.start_urls)} URLs from text file: {urls_file}")
+                    first_line = next((line.strip() for line in f if line.strip()), '')
+                    self.start_urls = None
+                    if first_line.startswith(('[', '{')):
+                        try:
+                            # Try to load as JSON array
+                            f.seek(0)
+                            self.start_urls = json.load(f)
+                            if not isinstance(self.start_urls, list):
+                                raise ValueError("JSON in urls_file must be a list of URLs")
+                            logger.info(f"Loaded {len(self.start_urls)} URLs from JSON file: {urls_file}")
+                        except json.JSONDecodeError:
+                            self.start_urls = None
+                    if self.start_urls is None:
+                        self.start_urls = []
+                        if first_line:
+                            # Fallback: treat as plain text, one URL per line
+                            self._urls_file = urls_file
+                            logger.info(f"Streaming URLs from text file: {urls_file}")
             except Exception as e:
                 logger.error(f"Error loading URLs from file {urls_file}: {e}")
                 raise
@@ -77,68 +102,75 @@ class BaseSpider(scrapy.Spider, ABC):
             message=f"Spider {self.name} initialized",
             category="spider.lifecycle",
             data={
-                "start_urls_count": len(self.start_urls),
+                "start_urls_count": None if self._urls_file else len(self.start_urls),
                 "urls_source": "file" if urls_file else "direct" if urls else "none"
             }
         )
 
     def start_requests(self) -> Generator[Request, None, None]:
         """Generate initial requests with proper URL handling."""
-        if not self.start_urls:
+        if not self.start_urls and not self._urls_file:
             logger.error("No URLs provided to spider")
             raise ValueError("No URLs provided to spider")
 
-        for url in self.start_urls:
-            try:
-                # Clean up malformed URLs
-                url = url.strip('"\'')  # Remove quotes
-                url = re.sub(r'https?://(https?://)', r'\1', url)  # Fix double protocols
-                
-                # Ensure URL has scheme
-                if not url.startswith(('http://', 'https://')):
-                    url = f'https://{url}'
+        for url in self._iter_start_urls():
+            request = self._build_request(url)
+            if request is not None:
+                yield request
+
+    def _iter_start_urls(self) -> Generator[str, None, None]:
+        """Yield seed URLs, streaming a plain-text urls_file one line at a time."""
+        if not self._urls_file:
+            yield from self.start_urls
+            return
+        with open(self._urls_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                url = line.strip()
+                if url:
+                    yield url
+
+    def _build_request(self, url: str) -> Optional[Request]:
+        """Clean and validate a seed URL, returning its request or None if it's skipped."""
+        try:
+            # Clean up malformed URLs
+            url = url.strip('"\'')  # Remove quotes
+            url = DOUBLE_SCHEME_RE.sub(r'\1', url)  # Fix double protocols
+            
+            # Ensure URL has scheme
+            if not url.startswith(('http://', 'https://')):
+                url = f'https://{url}'
+            
+            # Validate URL
+            netloc = NETLOC_RE.match(url).group(1)
+            if not netloc:
+                logger.warning(f"Skipping URL with no domain: {url}")
+                return None
                 
-                # Validate URL
-                parsed = urlparse(url)
-                if not parsed.netloc:
-                    logger.warning(f"Skipping URL with no domain: {url}")
-                    continue
+            # Check if any allowed domain matches the URL's domain or its parent domains
+            valid_domain = netloc in self._allowed_domain_set or netloc.endswith(self._allowed_domain_suffixes)
                     
-                # Check if any allowed domain matches the URL's domain or its parent domains
-                domain_parts = parsed.netloc.split('.')
-                valid_domain = False
-                for i in range(len(domain_parts) - 1):
-                    check_domain = '.'.join(domain_parts[i:])
-                    if check_domain in self.allowed_domains:
-                        valid_domain = True
-                        break
-                        
-                if not valid_domain:
-                    logger.warning(f"Skipping URL with invalid domain: {url}")
-                    continue
-                
-                add_breadcrumb(
-                    message="Processing URL",
-                    category="spider.request",
-                    data={"url": url}
-                )
-                
-                yield Request(
-                    url=url,
-                    callback=self.parse_product,
-                    headers=self._get_headers(),
-                    meta={
-                        'url': url,
-                        'dont_redirect': False,
-                        'handle_httpstatus_list': [403, 503],
-                        'download_timeout': 30,
-                    },
-                    errback=self.handle_error,
-                    dont_filter=True
-                )
-            except Exception as e:
-                capture_error(e, {"url": url})
-                logger.error(f"Failed to create request for URL {url}: {e}")
+            if not valid_domain:
+                logger.warning(f"Skipping URL with invalid domain: {url}")
+                return None
+            
+            add_breadcrumb(
+                message="Processing URL",
+                category="spider.request",
+                data={"url": url}
+            )
+            
+            return Request(
+                url=url,
+                callback=self.parse_product,
+                headers=self._request_headers,
+                meta={'url': url, **START_REQUEST_META},
+                errback=self.handle_error,
+                dont_filter=True
+            )
+        except Exception as e:
+            capture_error(e, {"url": url})
+            logger.error(f"Failed to create request for URL {url}: {e}")
+            return None
 
     def _get_headers(self) -> Dict[str, str]:
         """Get request headers. Override in subclass if needed."""
@@ -16,6 +16,9 @@ from scrapper.utils.sentry import add_breadcrumb, monitor_errors
 
 logger = logging.getLogger(__name__)
 
+# Czech-formatted amount, with digit groups separated by (non-breaking) spaces
+PRICE_RE = re.compile(r'(\d+(?:[\s\xa0]\d+)*)')
+
 class DatartSpider(BaseSpider):
     @property
     def allowed_domains(self) -> List[str]:
@@ -84,7 +87,7 @@ class DatartSpider(BaseSpider):
             if price_element:
                 item['raw_price'] = price_element.strip()
                 # Extract numerical price - handle Czech format with non-breaking spaces
-                price_match = re.search(r'(\d+(?:[\s\xa0]\d+)*)', price_element)
+                price_match = PRICE_RE.search(price_element)
                 if price_match:
                     price_str = price_match.group(1).replace(' ', '').replace('\xa0', '')
                     try:
@@ -173,7 +176,7 @@ class DatartSpider(BaseSpider):
         # Extract delivery cost - Updated selector
         delivery_cost = response.css('div.delivery-price::text').get()
         if delivery_cost:
-            cost_match = re.search(r'(\d+(?:[\s\xa0]\d+)*)', delivery_cost)
+            cost_match = PRICE_RE.search(delivery_cost)
             if cost_match:
                 cost_str = cost_match.group(1).replace(' ', '').replace('\xa0', '')
                 try:
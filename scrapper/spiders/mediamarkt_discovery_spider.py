@@ -28,9 +28,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
     def __init__(self, mode: str = 'full', *args: Any, **kwargs: Any) -> None:
         super().__init__(*args, **kwargs)
         self.mode = mode  # 'sitemap_only', 'category_only', 'full'
-        self.discovered_products = set()
         self.discovered_categories = set()
-        self.product_urls = []
         self.discovery_methods = {
             'sitemap': 0,
             'category_traversal': 0,
@@ -133,8 +131,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
                 if loc is not None:
                     url = loc.text
                     
-                    if self.is_product_url(url) and url not in self.discovered_products:
-                        self.discovered_products.add(url)
+                    if self.is_product_url(url) and self.add_product_url(url):
                         self.discovery_methods['sitemap'] += 1
                         url_count += 1
                         
@@ -151,11 +148,11 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
                             'discovered_at': self.get_timestamp()
                         }
                         
-                        self.product_urls.append(product_url_data)
+                        self.record_product(product_url_data)
                         
                         # Log progress every 500 products
-                        if len(self.discovered_products) % 500 == 0:
-                            self.logger.info(f"Discovered {len(self.discovered_products)} product URLs so far...")
+                        if self.product_count % 500 == 0:
+                            self.logger.info(f"Discovered {self.product_count} product URLs so far...")
             
             self.logger.info(f"Extracted {url_count} product URLs from {response.url}")
                             
@@ -183,8 +180,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
         product_links = response.css('a[href*="/product/"]::attr(href)').getall()
         for link in product_links:
             full_url = urljoin(response.url, link)
-            if self.is_product_url(full_url) and full_url not in self.discovered_products:
-                self.discovered_products.add(full_url)
+            if self.is_product_url(full_url) and self.add_product_url(full_url):
                 self.discovery_methods['category_traversal'] += 1
                 
                 # Store URL without making request
@@ -194,7 +190,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
                     'source_page': response.url,
                     'discovered_at': self.get_timestamp()
                 }
-                self.product_urls.append(product_url_data)
+                self.record_product(product_url_data)
 
     def parse_category(self, response: Response) -> Generator[Request, None, None]:
         """Parse category pages to discover product URLs and subcategories"""
@@ -213,8 +209,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
             product_links = response.css(selector).getall()
             for link in product_links:
                 full_url = urljoin(response.url, link)
-                if self.is_product_url(full_url) and full_url not in self.discovered_products:
-                    self.discovered_products.add(full_url)
+                if self.is_product_url(full_url) and self.add_product_url(full_url):
                     self.discovery_methods['category_traversal'] += 1
                     products_found += 1
                     
@@ -226,7 +221,7 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
                         'category': self.extract_category_name(response.url),
                         'discovered_at': self.get_timestamp()
                     }
-                    self.product_urls.append(product_url_data)
+                    self.record_product(product_url_data)
         
         self.logger.debug(f"Found {products_found} products on category page: {response.url}")
         
@@ -277,11 +272,6 @@ class MediaMarktDiscoverySpider(BaseDiscoverySpider):
             return match.group(1).replace('_', ' ').replace('-', ' ').title()
         return None
 
-    def get_timestamp(self) -> str:
-        """Get current timestamp"""
-        from datetime import datetime
-        return datetime.now().isoformat()
-
     def is_product_url(self, url: str) -> bool:
         """Check if URL is a product page"""
         product_patterns = [